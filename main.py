@@ -5,18 +5,34 @@ Automates the collection and monitoring of followers for a given X (Twitter) acc
 
 - Requires Playwright and Python 3.8+.
 - Needs a valid X (Twitter) session cookie (see README for setup).
-- Set the username via the X_USERNAME environment variable (no default).
-- Usage: python main.py [--debug]
+- Set the username via the X_USERNAME environment variable (no default), or list several
+  accounts in X_ACCOUNTS / accounts.json to monitor them concurrently in one browser.
+- Usage: python main.py [compact | history [--days=N] [--window=HOURS]] [--debug] [--daemon] [--resume]
 """
+import asyncio
+import contextvars
+import gzip
+import hashlib
+import itertools
 import json
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 import time
-from datetime import datetime
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+from datetime import datetime, timedelta
 import os
 import logging
+import random
+import re
+import sqlite3
 import sys
+from contextlib import closing
 import requests
 
+try:
+    import zstandard
+except ImportError:  # optional, only needed for X_SNAPSHOT_FORMAT=jsonl.zst
+    zstandard = None
+
 # =====================
 # Configurable Constants
 # =====================
@@ -30,20 +46,129 @@ USERNAME_SELECTOR = (
     "div[dir=\"ltr\"].css-146c3p1.r-dnmrzs.r-1udh08x.r-1udbk01.r-3s2u2q.r-bcqeeo.r-1ttztb7.r-qvutc0.r-37j5jr.r-a023e6.r-rjixqe.r-16dba41.r-18u37iz.r-1wvb978 > span"
 )
 TIMELINE_SELECTOR = "div[aria-label=\"Timeline: Followers\"]"
+FOLLOW_BUTTON_SELECTOR = "[data-testid$=\"-follow\"], [data-testid$=\"-unfollow\"]"
+LOGIN_SELECTOR = "a[href=\"/login\"], input[autocomplete=\"username\"]"
+
+# GraphQL endpoint serving the Followers timeline (used by the "graphql" collection mode)
+FOLLOWERS_GRAPHQL_PATH = "/Followers?"
+# GraphQL endpoint serving the profile, including the reported follower count
+PROFILE_GRAPHQL_PATH = "/UserByScreenName?"
+
+# A crawl is complete when it collected at least this share of the profile's reported
+# follower count (the count includes accounts X hides from the list); partial crawls
+# are merged into the previous snapshot and never report unfollows
+COMPLETENESS_RATIO = float(os.environ.get("X_COMPLETENESS_RATIO", "0.98"))
+# A crawl that would report more unfollows than the profile count's drop plus the new
+# followers (give or take this many, as the count moves during a long crawl) missed
+# followers rather than lost them, so it is treated as partial too
+UNFOLLOW_SLACK = int(os.environ.get("X_UNFOLLOW_SLACK", "10"))
+
+# Collection mode: "dom" scrapes rendered cells, "graphql" parses intercepted API responses,
+# "cursor" replays the Followers request page by page without scrolling
+COLLECTION_MODE = os.environ.get("X_COLLECTION_MODE", "dom").strip().lower()
+
+# Crawl mode: "full" walks the whole list, "incremental" stops once it reaches followers
+# already in the previous snapshot and runs a full sweep every FULL_SWEEP_INTERVAL_HOURS
+CRAWL_MODE = os.environ.get("X_CRAWL_MODE", "full").strip().lower()
+FULL_SWEEP_INTERVAL_HOURS = float(os.environ.get("X_FULL_SWEEP_HOURS", "24"))
+INCREMENTAL_OVERLAP = 20  # consecutive known followers (in previous order) that end a crawl
+RECENT_ORDER_SIZE = 1000  # newest-first usernames kept in each snapshot for overlap checks
 
 # Magic numbers as constants
-SCROLL_SLEEP_SEC = 1.5
-WAIT_NEW_CONTENT_TIMEOUT = 5
-WAIT_NEW_CONTENT_INTERVAL = 0.2
+WAIT_NEW_CONTENT_TIMEOUT = 5  # upper bound; waiting returns as soon as new cells render
+SCROLL_STEP_DEFAULT = 0.7  # fraction of the viewport scrolled per step
+SCROLL_STEP_MIN = 0.3
+SCROLL_STEP_MAX = 0.9
+TIMELINE_SCROLL_PX = 400  # timeline scrollBy at the default step
+SCROLL_DELAY_MAX_SEC = 60  # ceiling for the backoff delay between scrolls
+THROTTLE_BACKOFF_BASE_SEC = 2
+FAST_LOAD_SEC = 1  # pages loading faster than this let the pacer speed up
 NO_NEW_CONTENT_LIMIT = 10
 SCROLL_LIMIT = 500
 CHECKPOINT_INTERVAL = 15
 INITIAL_SELECTOR_TIMEOUT = 15000
+CURSOR_PAGE_SIZE = 100
+CURSOR_MAX_RETRIES = 3
+CURSOR_RETRY_BACKOFF_SEC = 2
+RATE_LIMIT_MAX_WAIT_SEC = 900
+
+# Request blocking while crawling (set X_BLOCK_RESOURCES=0 to load everything)
+BLOCK_RESOURCES = os.environ.get("X_BLOCK_RESOURCES", "1") != "0"
+BLOCKED_RESOURCE_TYPES = {
+    t.strip()
+    for t in os.environ.get("X_BLOCKED_RESOURCE_TYPES", "image,media,font").split(",")
+    if t.strip()
+}
+ALLOWED_HOSTS = ("x.com", "twitter.com", "twimg.com")  # subdomains included
+BLOCKED_URL_PATTERNS = ("/jot/", "/client_event", "/live_pipeline/", "/guide.json")
+# URL wildcards standing in for the blocked resource types when blocking through CDP
+# (used with X_PROFILE_DIR: routing requests would disable the profile's HTTP cache)
+RESOURCE_TYPE_URL_PATTERNS = {
+    "image": ("*pbs.twimg.com/*", "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*"),
+    "media": ("*video.twimg.com/*", "*.mp4*", "*.m3u8*"),
+    "font": ("*.woff*", "*.ttf*", "*.otf*"),
+}
+
+# Snapshot file format: "json" (indented JSON), or JSON Lines compressed with gzip
+# ("jsonl.gz") or zstd ("jsonl.zst", needs the zstandard package). JSONL snapshots are
+# a header line followed by one follower per line, so they are read as a stream.
+SNAPSHOT_EXTENSIONS = {"json": ".json", "jsonl.gz": ".jsonl.gz", "jsonl.zst": ".jsonl.zst"}
+SNAPSHOT_FORMAT = os.environ.get("X_SNAPSHOT_FORMAT", "json").strip().lower()
+SNAPSHOT_EXTENSION = SNAPSHOT_EXTENSIONS.get(SNAPSHOT_FORMAT, ".json")
+# Version 2 stores compact {id, username, name} records; version 1 also stored profile_url
+SNAPSHOT_VERSION = 2
 
 COOKIES_FILE = "cookies.json"
-OUTPUT_FILE = "followers_data.json"
+ACCOUNTS_FILE = "accounts.json"
+OUTPUT_FILE = f"followers_data{SNAPSHOT_EXTENSION}"
 HISTORY_DIR = "followers_history"
-LATEST_FILE = os.path.join(HISTORY_DIR, "latest.json")
+LATEST_STEM = "latest"
+LATEST_FILENAME = f"{LATEST_STEM}{SNAPSHOT_EXTENSION}"
+CHECKPOINT_FILENAME = "checkpoint.jsonl"  # append-only journal of the crawl in progress
+DELTAS_FILENAME = "deltas.jsonl"  # one line per run: followers added/removed since the last run
+OBJECTS_DIRNAME = "objects"  # base snapshots named by the hash of their follower list
+# Timestamped full snapshots written before the delta log; compaction folds them into it
+LEGACY_SNAPSHOT_PATTERN = re.compile(r"^followers_(\d{8}_\d{6})(\.json|\.jsonl\.gz|\.jsonl\.zst)$")
+
+# Runs between full base snapshots in the history; other runs only append a delta
+BASE_SNAPSHOT_INTERVAL = int(os.environ.get("X_BASE_SNAPSHOT_INTERVAL", "20"))
+
+# History retention for `python main.py compact`: every hour's last run is kept for
+# X_RETAIN_HOURLY_HOURS, every day's for X_RETAIN_DAILY_DAYS, then one run per week
+RETAIN_HOURLY_HOURS = int(os.environ.get("X_RETAIN_HOURLY_HOURS", "24"))
+RETAIN_DAILY_DAYS = int(os.environ.get("X_RETAIN_DAILY_DAYS", "30"))
+
+# Storage backend: "json" (files only) or "sqlite" (indexed followers/snapshots/events
+# database in the history directory). With sqlite, X_JSON_EXPORT=0 skips the JSON files.
+STORAGE_BACKEND = os.environ.get("X_STORAGE", "json").strip().lower()
+JSON_EXPORT = STORAGE_BACKEND != "sqlite" or os.environ.get("X_JSON_EXPORT", "1") != "0"
+DATABASE_FILENAME = "followers.db"
+
+# Accounts crawled at the same time, each in its own context of a shared browser
+MAX_CONCURRENCY = int(os.environ.get("X_CONCURRENCY", "3"))
+
+# Daemon mode (--daemon): crawl every account on its own schedule in one long-lived
+# browser. Accounts can override the interval with "interval_minutes" in accounts.json.
+DAEMON_INTERVAL_MINUTES = float(os.environ.get("X_DAEMON_INTERVAL_MINUTES", "360"))
+DAEMON_JITTER_MINUTES = float(os.environ.get("X_DAEMON_JITTER_MINUTES", "15"))
+
+# Warm starts: a persistent Chromium profile per account (keeps HTTP cache, service
+# worker and JS bundles) and/or a saved storage_state per account. Both hold session
+# data, so keep these directories out of uploaded artifacts.
+PROFILE_DIR = os.environ.get("X_PROFILE_DIR")
+STATE_DIR = os.environ.get("X_STATE_DIR")
+
+BROWSER_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-web-security",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+]
+VIEWPORT = {"width": 1920, "height": 4200}
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
 # =====================
 # Webhook Configuration
@@ -54,33 +179,46 @@ DISCORD_WEBHOOK_URL = os.environ.get("DISCORD_WEBHOOK_URL")
 # Logging Setup
 # =====================
 
+# Account handled by the current asyncio task, prefixed to its log messages
+current_account = contextvars.ContextVar("current_account", default=None)
+
+
+class AccountLogFilter(logging.Filter):
+    """Add the current task's account to log records as %(account)s."""
+
+    def filter(self, record):
+        account = current_account.get()
+        record.account = f"[@{account}] " if account else ""
+        return True
+
+
 def setup_logging(debug=False):
     level = logging.DEBUG if debug else logging.INFO
     logging.basicConfig(
         level=level,
-        format="%(asctime)s - %(levelname)s - %(message)s",
+        format="%(asctime)s - %(levelname)s - %(account)s%(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(AccountLogFilter())
     return logging.getLogger(__name__)
 
-# Parse CLI args for debug mode
+# Parse CLI args: an optional command ("compact", "history") plus debug, daemon and resume mode
+COMMAND = next((arg for arg in sys.argv[1:] if not arg.startswith("-")), "monitor")
 DEBUG_MODE = "--debug" in sys.argv
-logger = setup_logging(DEBUG_MODE)
+DAEMON_MODE = "--daemon" in sys.argv
+RESUME_MODE = "--resume" in sys.argv
 
-# =====================
-# Username (required)
-# =====================
-USERNAME = os.environ.get("X_USERNAME")
-if not USERNAME:
-    logger.error("X_USERNAME environment variable is required. Exiting.")
-    sys.exit(1)
 
-# Check for X_COOKIES or cookies.json
-COOKIES_ENV = os.environ.get("X_COOKIES")
-if not COOKIES_ENV and not os.path.exists(COOKIES_FILE):
-    logger.error("X_COOKIES environment variable or cookies.json file is required. Exiting.")
-    sys.exit(1)
+def cli_number(flag, default):
+    """Return the number given as --flag=N on the command line, or default."""
+    prefix = f"--{flag}="
+    for arg in sys.argv[1:]:
+        if arg.startswith(prefix):
+            return float(arg[len(prefix):])
+    return default
 
+logger = setup_logging(DEBUG_MODE)
 
 def load_cookies():
     """Load cookies from file (UTF-8) or environment variable (JSON string)."""
@@ -110,22 +248,212 @@ def normalize_same_site(cookie):
     return cookie
 
 
-def get_follower_data(page):
+class Account:
+    """A monitored X account: its cookies and where its snapshots are stored.
+
+    A single account keeps the top-level followers_data.json / followers_history
+    layout; when several accounts are monitored each gets its own directory
+    under HISTORY_DIR.
+    """
+
+    def __init__(self, username, cookies, shared_layout=True, interval_minutes=None):
+        self.username = username
+        self.interval_minutes = interval_minutes or DAEMON_INTERVAL_MINUTES
+        self.cookies = [normalize_same_site(cookie) for cookie in cookies]
+        if shared_layout:
+            self.history_dir = HISTORY_DIR
+            self.output_file = OUTPUT_FILE
+        else:
+            self.history_dir = os.path.join(HISTORY_DIR, username)
+            self.output_file = os.path.join(self.history_dir, OUTPUT_FILE)
+        self.latest_file = os.path.join(self.history_dir, LATEST_FILENAME)
+        self.checkpoint_file = os.path.join(self.history_dir, CHECKPOINT_FILENAME)
+        self.deltas_file = os.path.join(self.history_dir, DELTAS_FILENAME)
+        self.database_file = os.path.join(self.history_dir, DATABASE_FILENAME)
+        self.profile_dir = os.path.join(PROFILE_DIR, username) if PROFILE_DIR else None
+        self.storage_state_file = (
+            os.path.join(STATE_DIR, f"{username}.json") if STATE_DIR else None
+        )
+        # Last snapshot, kept in memory for the history delta and between daemon runs
+        self.previous_data = None
+        self.reported_followers = None  # follower count shown on the profile this run
+
+    def remember_snapshot(self, data):
+        """Keep the snapshot in memory for the next diff."""
+        self.previous_data = data
+
+
+def load_accounts(with_cookies=True):
+    """Build the list of accounts to monitor.
+
+    X_ACCOUNTS (JSON string) or accounts.json list the accounts as objects with a
+    "username" and optionally "cookies" (exported cookie list) or "cookies_file";
+    accounts without either share cookies.json / X_COOKIES. Without an accounts
+    list, the single X_USERNAME account is monitored. Commands that only touch
+    the stored history pass with_cookies=False.
+    """
+    if os.environ.get("X_ACCOUNTS"):
+        entries = json.loads(os.environ["X_ACCOUNTS"])
+    elif os.path.exists(ACCOUNTS_FILE):
+        with open(ACCOUNTS_FILE, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    else:
+        username = os.environ.get("X_USERNAME")
+        if not username:
+            raise ValueError(
+                "X_USERNAME environment variable (or X_ACCOUNTS / accounts.json) is required"
+            )
+        return [Account(username, load_cookies() if with_cookies else [])]
+
+    if not entries:
+        raise ValueError("Accounts list is empty")
+
+    accounts = []
+    for entry in entries:
+        if not with_cookies:
+            cookies = []
+        elif "cookies" in entry:
+            cookies = entry["cookies"]
+        elif "cookies_file" in entry:
+            with open(entry["cookies_file"], "r", encoding="utf-8") as f:
+                cookies = json.load(f)
+        else:
+            cookies = load_cookies()
+        accounts.append(
+            Account(
+                entry["username"],
+                cookies,
+                shared_layout=len(entries) == 1,
+                interval_minutes=entry.get("interval_minutes"),
+            )
+        )
+    return accounts
+
+
+# Page-side extractor shared by the full scan and the MutationObserver buffer
+EXTRACT_CELL_JS = f"""(cell) => {{
+    const nameElement = cell.querySelector('{NAME_SELECTOR}');
+    const usernameElement = cell.querySelector('{USERNAME_SELECTOR}');
+    if (nameElement && usernameElement) {{
+        const name = nameElement.innerText.trim();
+        const username = usernameElement.innerText.trim().replace('@', '');
+        if (name && username && !name.includes('@')) {{
+            // Follow buttons carry the user's numeric ID as "<id>-follow" / "<id>-unfollow"
+            const button = cell.querySelector('{FOLLOW_BUTTON_SELECTOR}');
+            const id = button ? button.getAttribute('data-testid').split('-')[0] : null;
+            return {{id: id, name: name, username: username}};
+        }}
+    }}
+    return null;
+}}"""
+
+# Installs window.__xfm: a MutationObserver that queues newly added follower cells
+# and a drain() that returns only followers not handed to Python before
+FOLLOWER_OBSERVER_JS = f"""() => {{
+    if (window.__xfm) {{
+        return true;
+    }}
+    const extract = {EXTRACT_CELL_JS};
+    const pending = new Set();
+    const known = new WeakSet();
+    const seen = new Set();
+    const state = {{added: 0, queue: []}};
+    const track = (cell) => {{
+        pending.add(cell);
+        if (!known.has(cell)) {{
+            known.add(cell);
+            state.added++;
+        }}
+    }};
+    const enqueue = (node) => {{
+        if (node.nodeType !== 1) {{
+            return;
+        }}
+        const cell = node.closest('{CELL_SELECTOR}');
+        if (cell) {{
+            track(cell);
+        }}
+        node.querySelectorAll('{CELL_SELECTOR}').forEach(track);
+    }};
+    const flush = () => {{
+        for (const cell of pending) {{
+            const item = extract(cell);
+            if (item) {{
+                pending.delete(cell);
+                if (!seen.has(item.username)) {{
+                    seen.add(item.username);
+                    state.queue.push(item);
+                }}
+            }} else if (!cell.isConnected) {{
+                pending.delete(cell);
+            }}
+        }}
+    }};
+    new MutationObserver(mutations => {{
+        mutations.forEach(m => m.addedNodes.forEach(enqueue));
+        flush();
+    }}).observe(document.body, {{childList: true, subtree: true}});
+    document.querySelectorAll('{CELL_SELECTOR}').forEach(enqueue);
+    flush();
+    state.drain = () => {{
+        flush();
+        const items = state.queue;
+        state.queue = [];
+        return items;
+    }};
+    window.__xfm = state;
+    return true;
+}}"""
+
+
+def should_block_request(request):
+    """Return True for requests that aren't needed to collect followers."""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urlsplit(request.url).hostname or ""
+    if not any(host == h or host.endswith("." + h) for h in ALLOWED_HOSTS):
+        return True
+    return any(pattern in request.url for pattern in BLOCKED_URL_PATTERNS)
+
+
+async def install_resource_blocking(context, page):
+    """Abort images, media, fonts, analytics and third-party requests for the context.
+
+    Playwright turns the HTTP cache off for routed contexts, so with a
+    persistent profile the page blocks URL patterns through CDP instead. That
+    keeps the cache warm but can't express the third-party host allowlist.
+    """
+    if PROFILE_DIR:
+        patterns = [f"*{pattern}*" for pattern in BLOCKED_URL_PATTERNS]
+        for resource_type in sorted(BLOCKED_RESOURCE_TYPES):
+            patterns.extend(RESOURCE_TYPE_URL_PATTERNS.get(resource_type, ()))
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.setBlockedURLs", {"urls": patterns})
+        logger.info(f"Blocking {len(patterns)} URL patterns (HTTP cache kept)")
+        return
+
+    async def handle_route(route):
+        if should_block_request(route.request):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle_route)
+    logger.info(f"Blocking resource types: {', '.join(sorted(BLOCKED_RESOURCE_TYPES))}")
+
+
+async def get_follower_data(page):
     """Extract follower name and username from the loaded page."""
     try:
-        return page.evaluate(
+        return await page.evaluate(
             f"""() => {{
-            const cells = document.querySelectorAll('{CELL_SELECTOR}');
+            const extract = {EXTRACT_CELL_JS};
             const results = [];
-            cells.forEach(cell => {{
-                const nameElement = cell.querySelector('{NAME_SELECTOR}');
-                const usernameElement = cell.querySelector('{USERNAME_SELECTOR}');
-                if (nameElement && usernameElement) {{
-                    const name = nameElement.innerText.trim();
-                    const username = usernameElement.innerText.trim().replace('@', '');
-                    if (name && username && !name.includes('@')) {{
-                        results.push({{name: name, username: username}});
-                    }}
+            document.querySelectorAll('{CELL_SELECTOR}').forEach(cell => {{
+                const item = extract(cell);
+                if (item) {{
+                    results.push(item);
                 }}
             }});
             return results;
@@ -136,38 +464,908 @@ def get_follower_data(page):
         return []
 
 
-def load_previous_data():
-    """Load the most recent followers data from the latest history file, if it exists."""
-    if os.path.exists(LATEST_FILE):
-        with open(LATEST_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+async def install_follower_observer(page):
+    """Inject the MutationObserver that buffers newly added follower cells page-side."""
+    try:
+        return bool(await page.evaluate(FOLLOWER_OBSERVER_JS))
+    except Exception as e:
+        logger.warning(f"Could not install follower observer: {e}")
+        return False
+
+
+async def drain_follower_observer(page):
+    """Return followers queued by the observer since the last drain.
+
+    Falls back to a full scan (and reinstalls the observer) if the page-side
+    state was lost, e.g. after a reload.
+    """
+    try:
+        items = await page.evaluate("() => window.__xfm ? window.__xfm.drain() : null")
+    except Exception as e:
+        logger.warning(f"Error draining follower observer: {e}")
+        items = None
+    if items is None:
+        await install_follower_observer(page)
+        return await get_follower_data(page)
+    return items
+
+
+def is_followers_response(url):
+    """Return True if the URL belongs to the Followers timeline GraphQL endpoint."""
+    return "/graphql/" in url and FOLLOWERS_GRAPHQL_PATH in url
+
+
+def _find_instructions(node):
+    """Locate the timeline 'instructions' list anywhere in a GraphQL payload."""
+    if isinstance(node, dict):
+        if isinstance(node.get("instructions"), list):
+            return node["instructions"]
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        found = _find_instructions(child)
+        if found is not None:
+            return found
     return None
 
 
-def compare_followers(previous_data, current_data):
-    """Compare previous and current follower lists, returning new and unfollowed users."""
+def parse_followers_response(payload):
+    """Extract follower entries and the bottom cursor from a Followers GraphQL payload."""
+    followers = []
+    cursor = None
+    for instruction in _find_instructions(payload) or []:
+        entries = list(instruction.get("entries") or [])
+        if instruction.get("entry"):
+            entries.append(instruction["entry"])
+        for entry in entries:
+            content = entry.get("content") or {}
+            if content.get("cursorType") == "Bottom":
+                cursor = content.get("value")
+                continue
+            user = (
+                (content.get("itemContent") or {}).get("user_results", {}).get("result")
+                or {}
+            )
+            if user.get("__typename") == "UserWithVisibility":
+                user = user.get("user") or {}
+            core = user.get("core") or {}
+            legacy = user.get("legacy") or {}
+            username = core.get("screen_name") or legacy.get("screen_name")
+            name = core.get("name") or legacy.get("name")
+            if username:
+                followers.append(
+                    {
+                        "id": user.get("rest_id"),
+                        "name": (name or username).strip(),
+                        "username": username,
+                    }
+                )
+    return followers, cursor
+
+
+def attach_graphql_collector(page):
+    """Subscribe to Followers GraphQL responses and buffer the parsed followers.
+
+    Must be attached before navigating so the first page of results is captured.
+    """
+    collector = {"followers": [], "cursor": None, "responses": 0, "request": None}
+
+    async def on_response(response):
+        if not is_followers_response(response.url):
+            return
+        if collector["request"] is None:
+            collector["request"] = {
+                "url": response.request.url,
+                "headers": dict(response.request.headers),
+            }
+        try:
+            payload = await response.json()
+        except Exception as e:
+            logger.debug(f"Could not parse Followers response: {e}")
+            return
+        followers, cursor = parse_followers_response(payload)
+        collector["followers"].extend(followers)
+        if cursor:
+            collector["cursor"] = cursor
+        collector["responses"] += 1
+        logger.debug(f"Captured {len(followers)} followers from GraphQL response")
+
+    page.on("response", on_response)
+    return collector
+
+
+def parse_follower_count(payload, username):
+    """Return the follower count from a UserByScreenName payload for username, or None."""
+    result = ((payload.get("data") or {}).get("user") or {}).get("result") or {}
+    legacy = result.get("legacy") or {}
+    screen_name = legacy.get("screen_name")
+    if screen_name and screen_name.lower() != username.lower():
+        return None
+    count = legacy.get("followers_count")
+    return count if isinstance(count, int) else None
+
+
+def attach_profile_collector(page, account):
+    """Record the profile's reported follower count on the account from UserByScreenName responses."""
+    account.reported_followers = None
+
+    async def on_response(response):
+        if "/graphql/" not in response.url or PROFILE_GRAPHQL_PATH not in response.url:
+            return
+        try:
+            count = parse_follower_count(await response.json(), account.username)
+        except Exception as e:
+            logger.debug(f"Could not parse profile response: {e}")
+            return
+        if count is not None:
+            account.reported_followers = count
+            logger.info(f"Profile reports {count} followers")
+
+    page.on("response", on_response)
+
+
+def drain_graphql_followers(collector):
+    """Return and clear the followers buffered by the GraphQL collector."""
+    followers = collector["followers"]
+    collector["followers"] = []
+    return followers
+
+
+async def collect_visible_followers(page, collector=None, observer=False):
+    """Collect followers using the GraphQL buffer when available, else the DOM.
+
+    With the observer installed only cells added since the previous call are
+    transferred; otherwise every visible cell is re-read.
+    """
+    if collector is not None and collector["responses"] > 0:
+        return drain_graphql_followers(collector)
+    if observer:
+        return await drain_follower_observer(page)
+    return await get_follower_data(page)
+
+
+def build_followers_request_url(template_url, cursor):
+    """Return the Followers GraphQL URL with its variables pointed at the given cursor."""
+    parts = urlsplit(template_url)
+    query = parse_qs(parts.query)
+    variables = json.loads(query["variables"][0])
+    variables["cursor"] = cursor
+    variables["count"] = CURSOR_PAGE_SIZE
+    query["variables"] = [json.dumps(variables, separators=(",", ":"))]
+    return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
+
+
+def rate_limit_wait_seconds(headers):
+    """Seconds until the rate-limit window in the response headers resets (capped)."""
+    try:
+        reset_at = int(headers.get("x-rate-limit-reset", 0))
+    except ValueError:
+        return CURSOR_RETRY_BACKOFF_SEC
+    wait = reset_at - time.time() + 1
+    return min(max(wait, CURSOR_RETRY_BACKOFF_SEC), RATE_LIMIT_MAX_WAIT_SEC)
+
+
+async def fetch_followers_page(page, request_template, cursor):
+    """Replay the Followers GraphQL request for one cursor from inside the browser context.
+
+    Returns (followers, next_cursor), or None if the page could not be fetched.
+    """
+    url = build_followers_request_url(request_template["url"], cursor)
+    for attempt in range(1, CURSOR_MAX_RETRIES + 1):
+        try:
+            response = await page.request.get(url, headers=request_template["headers"])
+        except Exception as e:
+            logger.warning(f"Followers request failed (attempt {attempt}): {e}")
+            await asyncio.sleep(CURSOR_RETRY_BACKOFF_SEC * attempt)
+            continue
+
+        headers = response.headers
+        if response.status == 429:
+            wait = rate_limit_wait_seconds(headers)
+            logger.info(f"Rate limited, waiting {wait:.0f}s before retrying")
+            await asyncio.sleep(wait)
+            continue
+        if not response.ok:
+            logger.warning(f"Followers request returned HTTP {response.status} (attempt {attempt})")
+            await asyncio.sleep(CURSOR_RETRY_BACKOFF_SEC * attempt)
+            continue
+
+        if headers.get("x-rate-limit-remaining") == "0":
+            wait = rate_limit_wait_seconds(headers)
+            logger.info(f"Rate limit exhausted, pausing {wait:.0f}s")
+            await asyncio.sleep(wait)
+
+        try:
+            return parse_followers_response(await response.json())
+        except Exception as e:
+            logger.warning(f"Could not parse Followers response: {e}")
+            return None
+    return None
+
+
+class CrawlState:
+    """Followers collected during one crawl, plus the order they were first seen in.
+
+    X lists followers newest-first, so in incremental mode the crawl can stop as
+    soon as INCREMENTAL_OVERLAP consecutive followers match the previous
+    snapshot's order; the rest of the list is then taken from that snapshot.
+    """
+
+    def __init__(self, incremental_base=None):
+        self.followers = {}  # follower_key -> record, so renames update in place
+        self.fingerprint = 0  # running sum of follower_hash over self.followers
+        self.order = []
+        self._keys = {}  # username -> follower_key
+        self.incremental_base = incremental_base
+        self.started = datetime.now().isoformat()
+        self.snapshot = None
+        self.unsaved = []  # followers added since the last checkpoint
+        self.checkpointed = False
+        self.overlap_found = False
+        self.interrupted = False  # stopped early; keep the journal for --resume
+        self.scrolls = 0  # scrolls or cursor pages, including resumed runs
+        self.cursor = None
+        self.last_seen = None
+        self.forwarding = False  # still scrolling past the restored followers
+        self._overlap_index = {}
+        self._overlap_needed = 0
+        self._overlap_run = 0
+        self._overlap_last = None
+        if incremental_base:
+            previous_order = incremental_base.get("recent_order") or []
+            self._overlap_index = {u: i for i, u in enumerate(previous_order)}
+            self._overlap_needed = min(INCREMENTAL_OVERLAP, len(previous_order))
+
+    def add(self, items):
+        """Add extracted follower items, returning how many were new."""
+        previous_count = len(self.followers)
+        for item in items:
+            username = item["username"]
+            known = self.followers.get(self._keys.get(username), {})
+            user_id = str(item["id"]) if item.get("id") else known.get("id")
+            record = follower_record(item["name"], username, user_id)
+            key = follower_key(record)
+            if known and not known.get("id") and user_id:
+                del self.followers[follower_key(known)]  # the same follower, now with its user ID
+                self.fingerprint -= follower_hash(known)
+            replaced = self.followers.get(key)
+            if replaced != record:
+                if replaced:
+                    self.fingerprint -= follower_hash(replaced)
+                self.fingerprint += follower_hash(record)
+                self.followers[key] = record
+                self.unsaved.append(key)
+            if username not in self._keys:
+                self.order.append(username)
+                self._track_overlap(username)
+            self._keys[username] = key
+        return len(self.followers) - previous_count
+
+    def restore(self, checkpoint):
+        """Seed the state from a crawl journal loaded by load_checkpoint()."""
+        self.add(checkpoint["followers"])
+        self.unsaved = []
+        self.checkpointed = True
+        self.started = checkpoint["started"] or self.started
+        self.scrolls = checkpoint.get("scrolls", 0)
+        self.cursor = checkpoint.get("cursor")
+        self.last_seen = checkpoint.get("last_seen")
+        logger.info(
+            f"Resuming crawl from {self.started}: {len(self.followers)} followers, "
+            f"{self.scrolls} scrolls done"
+        )
+
+    def _track_overlap(self, username):
+        if not self._overlap_needed or self.overlap_found:
+            return
+        index = self._overlap_index.get(username)
+        if index is None:
+            self._overlap_run = 0
+        elif self._overlap_run and index == self._overlap_last + 1:
+            self._overlap_run += 1
+        else:
+            self._overlap_run = 1
+        self._overlap_last = index
+        if self._overlap_run >= self._overlap_needed:
+            self.overlap_found = True
+            logger.info(
+                f"Reached {self._overlap_run} followers already in the previous snapshot. Stopping early"
+            )
+
+    def merge_snapshot(self, data):
+        """Add the followers of a snapshot that this crawl hasn't seen."""
+        for f in data["followers"]:
+            key = follower_key(f)
+            if key not in self.followers and f["username"] not in self._keys:
+                self.followers[key] = f
+                self.fingerprint += follower_hash(f)
+                self._keys[f["username"]] = key
+
+    def finalize(self):
+        """Merge the previous snapshot in after an incremental stop; return snapshot metadata."""
+        base = self.incremental_base
+        if base is None or not self.overlap_found:
+            return {"crawl_mode": "full", "last_full_sweep": datetime.now().isoformat()}
+
+        self.merge_snapshot(base)
+        seen_order = set(self.order)
+        self.order.extend(
+            u for u in base.get("recent_order") or [] if u not in seen_order
+        )
+        logger.info(f"Merged previous snapshot: {len(self.followers)} followers in total")
+        return {"crawl_mode": "incremental", "last_full_sweep": base.get("last_full_sweep")}
+
+
+def full_sweep_due(previous_data):
+    """Return True if the previous snapshot can't seed an incremental crawl."""
+    if not previous_data or not previous_data.get("recent_order"):
+        return True
+    last_full_sweep = previous_data.get("last_full_sweep")
+    if not last_full_sweep:
+        return True
+    next_sweep = datetime.fromisoformat(last_full_sweep) + timedelta(hours=FULL_SWEEP_INTERVAL_HOURS)
+    return datetime.now() >= next_sweep
+
+
+def write_checkpoint(account, state):
+    """Append the followers added since the last checkpoint to the crawl journal.
+
+    The journal is JSONL: a header line for the crawl, one line per follower and
+    a state line (scroll count, cursor, last-seen username) per checkpoint, so
+    each checkpoint costs O(new followers) instead of a full rewrite.
+    """
+    os.makedirs(account.history_dir, exist_ok=True)
+    mode = "a" if state.checkpointed else "w"
+    with open(account.checkpoint_file, mode, encoding="utf-8") as f:
+        if not state.checkpointed:
+            header = {"type": "crawl", "username": account.username, "started": state.started}
+            f.write(json.dumps(header) + "\n")
+        for key in dict.fromkeys(state.unsaved):
+            if key in state.followers:
+                f.write(json.dumps(state.followers[key], ensure_ascii=False) + "\n")
+        progress = {
+            "type": "state",
+            "scrolls": state.scrolls,
+            "cursor": state.cursor,
+            "last_seen": state.last_seen if state.forwarding else (state.order[-1] if state.order else None),
+        }
+        f.write(json.dumps(progress, ensure_ascii=False) + "\n")
+    state.checkpointed = True
+    logger.info(
+        f"Progress checkpoint: {len(state.followers)} followers collected ({len(state.unsaved)} new)"
+    )
+    state.unsaved = []
+
+
+def load_checkpoint(account):
+    """Read the crawl journal left by an interrupted run, or return None.
+
+    A torn last line (the run died mid-write) is ignored; followers listed after
+    the last state line are still kept.
+    """
+    if not os.path.exists(account.checkpoint_file):
+        return None
+    with open(account.checkpoint_file, "r", encoding="utf-8") as f:
+        content = f.read()
+    if content and not content.endswith("\n"):
+        # Cut the torn line off so the resumed run appends after a clean line break
+        logger.warning("Ignoring truncated line in checkpoint journal")
+        content = content[: content.rfind("\n") + 1]
+        with open(account.checkpoint_file, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    checkpoint = {"started": None, "followers": []}
+    for line in content.splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning("Ignoring unreadable line in checkpoint journal")
+            continue
+        kind = record.pop("type", None)
+        if kind == "crawl":
+            checkpoint["started"] = record.get("started")
+        elif kind == "state":
+            checkpoint.update(record)
+        elif "username" in record:
+            checkpoint["followers"].append(record)
+    if not checkpoint["followers"]:
+        return None
+    return checkpoint
+
+
+def unfollow_budget(state, previous_data, reported):
+    """Return how many previous followers the crawl is missing and how many unfollows the counts allow.
+
+    Between two runs the profile count changes by new followers minus unfollows,
+    so unfollows can't exceed the count's drop plus the new followers. Without
+    a previous reported count there is no bound and the missing count is allowed.
+    """
     if not previous_data:
+        return 0, 0
+    usernames = {f["username"] for f in state.followers.values()}
+    previous_keys, previous_usernames = set(), set()
+    missing = 0
+    for f in previous_data["followers"]:
+        key = follower_key(f)
+        previous_keys.add(key)
+        previous_usernames.add(f["username"])
+        if key not in state.followers and f["username"] not in usernames:
+            missing += 1
+    previous_reported = previous_data.get("reported_followers")
+    if previous_reported is None:
+        return missing, missing
+    new = sum(
+        1 for key, f in state.followers.items()
+        if key not in previous_keys and f["username"] not in previous_usernames
+    )
+    return missing, max(0, previous_reported - reported + new)
+
+
+def check_completeness(state, account):
+    """Tag the crawl complete, partial or unknown against the profile's reported follower count.
+
+    A partial crawl is merged into the previous snapshot, so the saved snapshot
+    is the running union of everything seen rather than a truncated list. A
+    crawl that reaches the ratio but would report more unfollows than the
+    profile count allows is partial too. When the profile count could not be
+    read the crawl can't be verified, so it is tagged unknown and handled like
+    a partial one. Returns the snapshot metadata.
+    """
+    reported = account.reported_followers
+    collected = len(state.followers)
+    if reported is None:
+        logger.warning("Profile follower count unknown - unfollows will not be reported for this run")
+        metadata = {"completeness": "unknown"}
+    elif collected < reported * COMPLETENESS_RATIO:
+        logger.warning(f"Partial crawl: collected {collected} of {reported} reported followers")
+        metadata = {"completeness": "partial", "reported_followers": reported}
+    else:
+        missing, plausible = unfollow_budget(state, account.previous_data, reported)
+        if missing <= plausible + UNFOLLOW_SLACK:
+            return {"completeness": "complete", "reported_followers": reported}
+        logger.warning(
+            f"Partial crawl: {missing} followers missing but the profile count only "
+            f"accounts for {plausible} unfollows"
+        )
+        metadata = {"completeness": "partial", "reported_followers": reported}
+
+    if account.previous_data:
+        state.merge_snapshot(account.previous_data)
+        logger.info(f"Merged into the previous snapshot: {len(state.followers)} followers")
+    return metadata
+
+
+def finish_crawl(state, account):
+    """Finalize the crawl, write the full snapshot once and drop the checkpoint journal.
+
+    Only a finished crawl is promoted to the snapshot files. An interrupted one
+    stays in the journal (state.snapshot is left as None) so latest keeps the
+    last complete baseline and the next --resume run can continue the crawl.
+    """
+    if state.interrupted:
+        write_checkpoint(account, state)
+        logger.warning(
+            "Crawl stopped before the end of the list. Keeping the previous snapshot; "
+            "run with --resume to continue"
+        )
+        return state
+    metadata = state.finalize()
+    metadata.update(check_completeness(state, account))
+    metadata["fingerprint"] = format_fingerprint(state.fingerprint)
+    state.snapshot = save_progress(account, state.followers.values(), state.order, metadata)
+    if os.path.exists(account.checkpoint_file):
+        os.remove(account.checkpoint_file)
+    return state
+
+
+async def walk_followers_cursor(page, account, collector, incremental_base=None, resume=None):
+    """Collect all followers by walking the Followers GraphQL cursors back to back.
+
+    Uses the request captured by the GraphQL collector as a template, so no
+    scrolling or content polling is involved. A resume checkpoint continues
+    from its saved cursor. Returns the CrawlState, or None if no request was
+    captured and the caller should fall back to scrolling.
+    """
+    logger.info("Starting cursor-based follower collection...")
+    try:
+        await page.wait_for_selector(CELL_SELECTOR, timeout=INITIAL_SELECTOR_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Could not find follower cells: {e}")
+
+    request_template = collector["request"]
+    if request_template is None:
+        logger.warning("No Followers GraphQL request captured. Falling back to scrolling")
         return None
 
-    prev_usernames = {f["username"] for f in previous_data["followers"]}
-    curr_usernames = {f["username"] for f in current_data["followers"]}
+    state = CrawlState(incremental_base)
+    if resume:
+        state.restore(resume)
+    state.add(drain_graphql_followers(collector))
+    logger.info(f"Initial collection: {len(state.followers)} unique followers")
 
-    unfollowed = prev_usernames - curr_usernames
-    new_followers = curr_usernames - prev_usernames
+    # state.cursor is always the next page to fetch, so a checkpoint resumes there
+    state.cursor = state.cursor or collector["cursor"]
+    seen_cursors = set()
+    page_count = 0
+    while (
+        state.cursor
+        and state.cursor not in seen_cursors
+        and not state.cursor.startswith("0|")
+        and not state.overlap_found
+    ):
+        seen_cursors.add(state.cursor)
+        page_count += 1
+        state.scrolls += 1
 
-    unfollowed_data = [
-        f for f in previous_data["followers"] if f["username"] in unfollowed
-    ]
-    new_follower_data = [
-        f for f in current_data["followers"] if f["username"] in new_followers
+        result = await fetch_followers_page(page, request_template, state.cursor)
+        if result is None:
+            logger.warning("Giving up on cursor walk after repeated failures")
+            state.interrupted = True
+            break
+        followers, next_cursor = result
+
+        followers_added = state.add(followers)
+        logger.debug(f"Page #{page_count}: {followers_added} new followers")
+
+        if not followers:
+            break
+        state.cursor = next_cursor
+
+        if page_count % CHECKPOINT_INTERVAL == 0:
+            write_checkpoint(account, state)
+
+    logger.info(f"Cursor walk completed! Total followers collected: {len(state.followers)}")
+    return finish_crawl(state, account)
+
+
+def follower_record(name, username, user_id=None):
+    """Return the canonical stored record for a follower (id omitted when unknown)."""
+    record = {"id": user_id} if user_id else {}
+    record["username"] = username
+    record["name"] = name
+    return record
+
+
+def follower_hash(record):
+    """Return a 64-bit hash of a follower record, the term it adds to a snapshot fingerprint."""
+    text = json.dumps(record, ensure_ascii=False, sort_keys=True)
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def format_fingerprint(total):
+    """Format a sum of follower hashes as a snapshot fingerprint (16 hex digits, mod 2**64)."""
+    return f"{total & FINGERPRINT_MASK:016x}"
+
+
+def snapshot_fingerprint(followers):
+    """Return the order-independent fingerprint of a follower list."""
+    return format_fingerprint(sum(follower_hash(f) for f in followers))
+
+
+def follower_key(record):
+    """Return a follower's identity: the stable user ID, or "@username" when it isn't known."""
+    return record.get("id") or "@" + record["username"]
+
+
+def profile_url(username):
+    """Return the profile URL for a username (derived at render time, never stored)."""
+    return f"https://x.com/{username}"
+
+
+def upgrade_follower(follower, version):
+    """Convert a follower record read from a snapshot of the given version to the current format."""
+    if version >= SNAPSHOT_VERSION:
+        return follower
+    return follower_record(follower["name"], follower["username"], follower.get("id"))
+
+
+class SnapshotCorruptError(ValueError):
+    """A snapshot file failed its checksum or is truncated."""
+
+
+# Snapshot fingerprints are sums of 64-bit follower hashes, so followers can be
+# added and removed without rehashing the whole set
+FINGERPRINT_MASK = (1 << 64) - 1
+
+# Checksum footer of .json snapshots: the last key, over the text before it
+JSON_CHECKSUM_MARKER = ',\n  "checksum": "'
+
+
+def open_snapshot_stream(path, mode, kind=None):
+    """Open a snapshot file as text, decompressing/compressing by its extension (or kind)."""
+    kind = kind or path
+    if kind.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if kind.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("The zstandard package is required for .zst snapshots")
+        return zstandard.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _fsync_path(path, flags=os.O_RDWR):
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _previous_snapshot_path(path):
+    """Return where the last good copy of a snapshot is kept: latest.json -> latest.prev.json."""
+    for ext in SNAPSHOT_EXTENSIONS.values():
+        if path.endswith(ext):
+            return path[: -len(ext)] + ".prev" + ext
+    return path + ".prev"
+
+
+def write_snapshot(path, data, keep_previous=False):
+    """Atomically write a snapshot as indented JSON or, for .jsonl* paths, streamed JSON Lines.
+
+    The data goes to a temp file that is fsynced and renamed over the target,
+    so a crash never leaves a truncated snapshot behind. A SHA-256 checksum is
+    written as a footer and verified by read_snapshot. With keep_previous the
+    replaced file is kept as the .prev fallback.
+    """
+    tmp_path = path + ".tmp"
+    if path.endswith(".json"):
+        body = {k: v for k, v in data.items() if k != "checksum"}
+        text = json.dumps(body, ensure_ascii=False, indent=2)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text[:-2] + JSON_CHECKSUM_MARKER + digest + '"\n}')
+    else:
+        header = {k: v for k, v in data.items() if k != "followers"}
+        header["integrity"] = "sha256"
+        digest = hashlib.sha256()
+        with open_snapshot_stream(tmp_path, "w", kind=path) as f:
+            for record in itertools.chain([header], data["followers"]):
+                line = json.dumps(record, ensure_ascii=False) + "\n"
+                digest.update(line.encode("utf-8"))
+                f.write(line)
+            f.write(json.dumps({"sha256": digest.hexdigest()}) + "\n")
+
+    _fsync_path(tmp_path)
+    if keep_previous and os.path.exists(path):
+        os.replace(path, _previous_snapshot_path(path))
+    os.replace(tmp_path, path)
+    if os.name == "posix":
+        _fsync_path(os.path.dirname(path) or ".", os.O_RDONLY)
+
+
+def read_snapshot(path):
+    """Read a snapshot written by write_snapshot, upgrading older format versions.
+
+    JSONL snapshots are decoded line by line, so the decompressed text is never
+    held in memory alongside the parsed followers. Raises SnapshotCorruptError
+    if the checksum footer doesn't match; files written before checksums were
+    added are accepted as-is.
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        marker = text.rfind(JSON_CHECKSUM_MARKER)
+        if marker != -1:
+            expected = text[marker + len(JSON_CHECKSUM_MARKER):].split('"', 1)[0]
+            body = text[:marker] + "\n}"
+            if hashlib.sha256(body.encode("utf-8")).hexdigest() != expected:
+                raise SnapshotCorruptError(f"Checksum mismatch in {path}")
+        data = json.loads(text)
+        data.pop("checksum", None)
+        version = data.get("format_version", 1)
+        data["followers"] = [upgrade_follower(f, version) for f in data["followers"]]
+    else:
+        records = _iter_jsonl_snapshot(path)
+        data = next(records)
+        data["followers"] = list(records)
+    data["format_version"] = SNAPSHOT_VERSION
+    return data
+
+
+def _iter_jsonl_snapshot(path):
+    """Yield a JSONL snapshot's header, then its upgraded follower records one by one.
+
+    The checksum footer is verified once the records are exhausted.
+    """
+    digest = hashlib.sha256()
+    footer = None
+    with open_snapshot_stream(path, "r") as f:
+        header_line = f.readline()
+        digest.update(header_line.encode("utf-8"))
+        header = json.loads(header_line)
+        integrity = header.pop("integrity", None)
+        version = header.get("format_version", 1)
+        yield header
+        for line in f:
+            if not line.strip():
+                continue
+            if footer is not None:
+                raise SnapshotCorruptError(f"Data after checksum footer in {path}")
+            record = json.loads(line)
+            if "sha256" in record:
+                footer = record["sha256"]
+                continue
+            digest.update(line.encode("utf-8"))
+            yield upgrade_follower(record, version)
+    if integrity and footer != digest.hexdigest():
+        raise SnapshotCorruptError(f"Missing or mismatched checksum in {path}")
+
+
+def remove_other_formats(path):
+    """Delete copies of a snapshot (and its .prev fallback) left in other formats.
+
+    After X_SNAPSHOT_FORMAT changes, a stale file in the old format would
+    otherwise be found again if the format is switched back.
+    """
+    for ext in SNAPSHOT_EXTENSIONS.values():
+        if ext == SNAPSHOT_EXTENSION:
+            continue
+        stem = path[: -len(SNAPSHOT_EXTENSION)]
+        for stale in (stem + ext, stem + ".prev" + ext):
+            if os.path.exists(stale):
+                os.remove(stale)
+                logger.info(f"Removed {stale} left over from another snapshot format")
+
+
+def find_snapshot(directory, stem):
+    """Return the existing snapshot file for a stem, preferring the configured format."""
+    extensions = [SNAPSHOT_EXTENSION] + [
+        ext for ext in SNAPSHOT_EXTENSIONS.values() if ext != SNAPSHOT_EXTENSION
     ]
+    for ext in extensions:
+        path = os.path.join(directory, stem + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_previous_data(account):
+    """Load the most recent followers data from the configured store, if it exists.
+
+    A corrupt or truncated latest snapshot is rebuilt from the history log, so
+    the next delta continues the chain; without a usable log it falls back to
+    the previous good snapshot, and a log that can't follow from that one
+    restarts from a fresh base.
+    """
+    if STORAGE_BACKEND == "sqlite":
+        data = sqlite_load_latest(account)
+        if data is not None:
+            return data
+    path = find_snapshot(account.history_dir, LATEST_STEM)
+    if path:
+        try:
+            return read_snapshot(path)
+        except Exception as e:
+            logger.warning(f"Could not read {path}: {e}. Recovering the previous run")
+    has_log = os.path.exists(account.deltas_file)
+    if has_log:
+        try:
+            data = rebuild_snapshot(account.history_dir)
+        except Exception as e:
+            logger.warning(f"Could not rebuild the latest snapshot from the history log: {e}")
+            data = None
+        if data is not None:
+            return data
+
+    path = find_snapshot(account.history_dir, f"{LATEST_STEM}.prev")
+    if not path:
+        return None
+    try:
+        data = read_snapshot(path)
+    except Exception as e:
+        logger.warning(f"Could not read {path}: {e}")
+        return None
+    if has_log:
+        # The log's last run isn't this snapshot; a delta against it would break the chain
+        data["rebase_history"] = True
+    return data
+
+
+def followers_by_username(data):
+    """Return a snapshot's followers sorted by username.
+
+    Snapshots written since followers were stored in username order are used
+    as-is; older ones (sorted by display name) are sorted here.
+    """
+    if data.get("sorted_by") == "username":
+        return data["followers"]
+    return sorted(data["followers"], key=lambda f: f["username"])
+
+
+def _next_other_username(followers, username):
+    """Advance a sorted follower stream past any more records for username."""
+    return next((f for f in followers if f["username"] != username), None)
+
+
+def diff_followers(previous, current):
+    """Merge-join two follower streams sorted by username in a single pass.
+
+    Yields ("unfollowed", record), ("new_followers", record) and, when a
+    username is kept but the display name changed, ("renamed", {"before",
+    "after"}) pairs in username order, holding one record of each stream at a
+    time. A username that now belongs to a different user ID counts as an
+    unfollow plus a new follower.
+    """
+    previous, current = iter(previous), iter(current)
+    prev, curr = next(previous, None), next(current, None)
+    while prev is not None or curr is not None:
+        if curr is None or (prev is not None and prev["username"] < curr["username"]):
+            yield "unfollowed", prev
+            prev = _next_other_username(previous, prev["username"])
+        elif prev is None or curr["username"] < prev["username"]:
+            yield "new_followers", curr
+            curr = _next_other_username(current, curr["username"])
+        else:
+            if prev.get("id") and curr.get("id") and prev["id"] != curr["id"]:
+                yield "unfollowed", prev
+                yield "new_followers", curr
+            elif prev["name"] != curr["name"]:
+                yield "renamed", {"before": prev, "after": curr}
+            prev = _next_other_username(previous, prev["username"])
+            curr = _next_other_username(current, curr["username"])
 
-    return {
-        "unfollowed": unfollowed_data,
-        "new_followers": new_follower_data,
-        "unfollowed_count": len(unfollowed),
-        "new_followers_count": len(new_followers),
-    }
+
+def compare_followers(previous_data, current_data):
+    """Compare previous and current follower lists, returning new, unfollowed and renamed users.
+
+    An unfollow and a new follower with the same user ID are one follower who
+    changed handle, reported under "renamed" instead. Returns None without
+    diffing when both snapshots carry the same fingerprint and count.
+    """
+    if not previous_data:
+        return None
+    fingerprint = previous_data.get("fingerprint")
+    if (
+        fingerprint
+        and fingerprint == current_data.get("fingerprint")
+        and previous_data["total_followers"] == current_data["total_followers"]
+    ):
+        logger.info("No follower changes (snapshot fingerprints match)")
+        return None
+
+    changes = {"unfollowed": [], "new_followers": [], "renamed": []}
+    for kind, follower in diff_followers(
+        followers_by_username(previous_data), followers_by_username(current_data)
+    ):
+        changes[kind].append(follower)
+
+    unfollowed_ids = {f["id"]: f for f in changes["unfollowed"] if f.get("id")}
+    if unfollowed_ids:
+        new_followers = []
+        for follower in changes["new_followers"]:
+            before = unfollowed_ids.pop(follower.get("id"), None)
+            if before is None:
+                new_followers.append(follower)
+            else:
+                changes["renamed"].append({"before": before, "after": follower})
+        changes["new_followers"] = new_followers
+        changes["unfollowed"] = [
+            f for f in changes["unfollowed"] if not f.get("id") or f["id"] in unfollowed_ids
+        ]
+
+    if current_data.get("completeness") in ("partial", "unknown"):
+        # An unverified crawl can't tell unfollows apart from followers it didn't reach
+        changes["unfollowed"] = []
+
+    changes["unfollowed_count"] = len(changes["unfollowed"])
+    changes["new_followers_count"] = len(changes["new_followers"])
+    changes["renamed_count"] = len(changes["renamed"])
+    return changes
+
+
+def rename_labels(rename):
+    """Return (name, handle) labels for a rename, e.g. ("Old → New", "@user")."""
+    before, after = rename["before"], rename["after"]
+    name = after["name"]
+    if before["name"] != after["name"]:
+        name = f"{before['name']} → {after['name']}"
+    handle = f"@{after['username']}"
+    if before["username"] != after["username"]:
+        handle = f"@{before['username']} → @{after['username']}"
+    return name, handle
 
 
 def send_to_discord(changes, username):
@@ -187,13 +1385,26 @@ def send_to_discord(changes, username):
 
     def _format_users(users):
         """Return a newline-separated bullet list truncated to Discord limits."""
-        lines = [f"• {u['name']} (@{u['username']})" for u in users]
+        lines = [
+            f"• {u['name']} ([@{u['username']}]({profile_url(u['username'])}))" for u in users
+        ]
         description = "\n".join(lines)
         # Truncate long descriptions to stay within Discord limits (safety margin)
         if len(description) > MAX_EMBED_DESC_LENGTH:
             description = description[: MAX_EMBED_DESC_LENGTH - 3] + "..."
         return description
 
+    def _format_renames(renames):
+        """Return a bullet list of renames, linking to the current profile."""
+        lines = []
+        for rename in renames:
+            name, handle = rename_labels(rename)
+            lines.append(f"• {name} ([{handle}]({profile_url(rename['after']['username'])}))")
+        description = "\n".join(lines)
+        if len(description) > MAX_EMBED_DESC_LENGTH:
+            description = description[: MAX_EMBED_DESC_LENGTH - 3] + "..."
+        return description
+
     # Unfollowed users
     if changes["unfollowed_count"] > 0:
         description = _format_users(changes["unfollowed"])
@@ -216,6 +1427,16 @@ def send_to_discord(changes, username):
             }
         )
 
+    # Renamed followers (same user ID, new handle or display name)
+    if changes.get("renamed_count", 0) > 0:
+        embeds.append(
+            {
+                "title": f"✏️ {changes['renamed_count']} Renamed",
+                "description": _format_renames(changes["renamed"]),
+                "color": 3447003,  # Blue
+            }
+        )
+
     # Net change
     net_change = changes["new_followers_count"] - changes["unfollowed_count"]
     if net_change > 0:
@@ -229,7 +1450,7 @@ def send_to_discord(changes, username):
         net_color = 8359053  # Grey
 
     embeds.append(
-        {"title": net_change_text, "color": net_color}
+        {"title": net_change_text, "color": net_color, "footer": {"text": f"@{username}"}}
     )
 
     data = {
@@ -246,123 +1467,938 @@ def send_to_discord(changes, username):
         logger.error(f"Error sending notification to Discord: {e}")
 
 
-def save_progress(follower_data, username):
-    """Save current follower data to output, latest, and timestamped backup files."""
-    os.makedirs(HISTORY_DIR, exist_ok=True)
-    logger.info(f"Saving progress for {len(follower_data)} followers")
+def _records_by_key(followers):
+    """Index follower records by follower_key."""
+    return {follower_key(f): f for f in followers}
+
+
+def _sorted_records(records):
+    """Return follower records in snapshot order: by username, then name."""
+    return sorted(records, key=lambda f: (f["username"], f["name"]))
+
 
-    followers_with_urls = []
-    for name, uname in sorted(follower_data):
-        followers_with_urls.append(
-            {"name": name, "username": uname, "profile_url": f"https://x.com/{uname}"}
+def snapshot_digest(followers):
+    """Return the SHA-256 of a follower list, independent of the snapshot's timestamp."""
+    digest = hashlib.sha256()
+    for record in followers:
+        digest.update(json.dumps(record, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def store_snapshot_object(history_dir, data):
+    """Store a snapshot's followers under objects/<sha256>, returning the relative path.
+
+    An unchanged follower set maps to the existing object, so it costs no
+    extra storage or upload.
+    """
+    relative_path = f"{OBJECTS_DIRNAME}/{snapshot_digest(data['followers'])}{SNAPSHOT_EXTENSION}"
+    path = os.path.join(history_dir, relative_path)
+    if os.path.exists(path):
+        logger.debug(f"Snapshot unchanged, reusing {relative_path}")
+        return relative_path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    content = {
+        key: data[key]
+        for key in ("format_version", "username", "total_followers", "sorted_by")
+        if key in data
+    }
+    content["followers"] = data["followers"]
+    write_snapshot(path, content)
+    return relative_path
+
+
+def append_history(account, data):
+    """Record the run in the history log, writing a full base snapshot when due.
+
+    Each line of deltas.jsonl holds the followers added and removed since the
+    previous run, those renamed, and those whose record only gained or lost
+    its user ID ("updated"); every BASE_SNAPSHOT_INTERVAL runs (or when there is nothing
+    to diff against) the line also points at a content-addressed base under
+    objects/ that rebuild_snapshot can start from. The log is the manifest
+    mapping run timestamps to those objects.
+    """
+    previous = account.previous_data
+    if previous and previous.get("rebase_history"):
+        logger.warning("Previous snapshot doesn't match the history log. Starting a fresh base")
+        previous = None
+    entry = {"timestamp": data["timestamp"], "total": data["total_followers"]}
+    if previous:
+        entry.update(_history_delta(previous, data))
+
+    runs_since_base = (previous or {}).get("runs_since_base")
+    base_file = None
+    if runs_since_base is None or runs_since_base + 1 >= BASE_SNAPSHOT_INTERVAL:
+        entry["base"] = store_snapshot_object(account.history_dir, data)
+        base_file = os.path.join(account.history_dir, entry["base"])
+        data["runs_since_base"] = 0
+    else:
+        data["runs_since_base"] = runs_since_base + 1
+
+    with open(account.deltas_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return base_file
+
+
+def _history_delta(previous, data):
+    """Return the added/removed/renamed/updated lists of a delta log entry between two snapshots."""
+    current = _records_by_key(data["followers"])
+    prev = _records_by_key(previous["followers"])
+    added_keys, removed_keys = current.keys() - prev.keys(), prev.keys() - current.keys()
+    renamed = [current[k] for k in current.keys() & prev.keys() if current[k] != prev[k]]
+    # A record that gained or lost its user ID changes key but not follower; pair it
+    # by username, as diff_followers does, instead of logging an unfollow plus a follow
+    removed_by_username = {prev[k]["username"]: k for k in removed_keys}
+    updated = []
+    for key in list(added_keys):
+        record = current[key]
+        old_key = removed_by_username.get(record["username"])
+        if old_key is not None and not (record.get("id") and prev[old_key].get("id")):
+            added_keys.discard(key)
+            removed_keys.discard(old_key)
+            if record["name"] == prev[old_key]["name"]:
+                updated.append(record)
+            else:
+                renamed.append(record)
+    entry = {
+        "added": _sorted_records(current[k] for k in added_keys),
+        "removed": _sorted_records(prev[k] for k in removed_keys),
+    }
+    if renamed:
+        entry["renamed"] = _sorted_records(renamed)
+    if updated:
+        entry["updated"] = _sorted_records(updated)
+    return entry
+
+
+def read_history_log(history_dir):
+    """Yield the entries of a history directory's delta log, oldest first."""
+    path = os.path.join(history_dir, DELTAS_FILENAME)
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # A run interrupted mid-append leaves a partial last line
+                logger.warning(f"Skipping unreadable line in {path}")
+
+
+def rebuild_snapshot(history_dir, at=None):
+    """Rebuild the follower list as it was at the given ISO timestamp (default: latest run).
+
+    Starts from the newest base snapshot at or before that time and replays the
+    deltas after it. Returns None if the log has no base that early.
+    """
+    entries = []
+    for entry in read_history_log(history_dir):
+        if at is not None and entry["timestamp"] > at:
+            break
+        entries.append(entry)
+    base_index = next(
+        (i for i in range(len(entries) - 1, -1, -1) if entries[i].get("base")), None
+    )
+    if base_index is None:
+        return None
+
+    base = read_snapshot(os.path.join(history_dir, entries[base_index]["base"]))
+    records = _records_by_key(base["followers"])
+    keys_by_username = {f["username"]: key for key, f in records.items()}
+    for entry in entries[base_index + 1:]:
+        for key, record in _records_by_key(entry.get("removed", [])).items():
+            # a folded span may remove a follower under the key they gained or
+            # lost an ID to, while the base still holds them under the other one
+            old_key = keys_by_username.pop(record["username"], key)
+            if records.get(old_key, {}).get("username") == record["username"]:
+                del records[old_key]
+            records.pop(key, None)
+        for kind in ("added", "renamed", "updated"):
+            for record in map(_without_event_time, entry.get(kind, [])):
+                key = follower_key(record)
+                old_key = keys_by_username.get(record["username"], key)
+                if old_key != key and records.get(old_key, {}).get("username") == record["username"]:
+                    del records[old_key]  # the same follower, stored under its other key
+                records[key] = record
+                keys_by_username[record["username"]] = key
+
+    return {
+        "format_version": SNAPSHOT_VERSION,
+        "username": base["username"],
+        "timestamp": entries[-1]["timestamp"],
+        "total_followers": len(records),
+        "sorted_by": "username",
+        "fingerprint": snapshot_fingerprint(records.values()),
+        "followers": _sorted_records(records.values()),
+    }
+
+
+def retention_bucket(timestamp, now):
+    """Return the retention bucket of a run: its hour, day or ISO week depending on age."""
+    age = now - timestamp
+    if age < timedelta(hours=RETAIN_HOURLY_HOURS):
+        return timestamp.strftime("%Y-%m-%dT%H")
+    if age < timedelta(days=RETAIN_DAILY_DAYS):
+        return timestamp.strftime("%Y-%m-%d")
+    year, week, _ = timestamp.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _without_event_time(record):
+    """Return a delta record without the "at" event time compaction may add to it."""
+    if "at" not in record:
+        return record
+    return {k: v for k, v in record.items() if k != "at"}
+
+
+def _fold_deltas(entries):
+    """Merge consecutive delta log entries into the last one without losing events.
+
+    The merged added/removed/renamed/updated lists hold the net change, so
+    rebuild_snapshot still replays correctly. Records whose event happened in
+    an earlier run of the span keep its timestamp as "at". Followers who came
+    and went within the span (or left and came back) are listed under "churn"
+    with both timestamps.
+    """
+    added, removed, renamed, updated = {}, {}, {}, {}  # follower_key -> (record, timestamp)
+    renamed_before_removal = set()
+    churn = []
+    for entry in entries:
+        churn.extend(entry.get("churn", []))
+        for record in entry.get("removed", []):
+            key, at = follower_key(record), record.get("at", entry["timestamp"])
+            record = _without_event_time(record)
+            if renamed.pop(key, None) or updated.pop(key, None):
+                renamed_before_removal.add(key)
+            if key in added:
+                first, followed = added.pop(key)
+                churn.append({**first, "followed": followed, "unfollowed": at})
+            else:
+                removed[key] = (record, at)
+        for record in entry.get("added", []):
+            key, at = follower_key(record), record.get("at", entry["timestamp"])
+            record = _without_event_time(record)
+            if key in removed:
+                previous, unfollowed = removed.pop(key)
+                churn.append({**record, "unfollowed": unfollowed, "followed": at})
+                if record != previous or key in renamed_before_removal:
+                    renamed[key] = (record, at)  # back under a name the span started without
+                renamed_before_removal.discard(key)
+            else:
+                added[key] = (record, at)
+        for kind, changed in (("renamed", renamed), ("updated", updated)):
+            for record in entry.get(kind, []):
+                key, at = follower_key(record), record.get("at", entry["timestamp"])
+                record = _without_event_time(record)
+                if key in added:
+                    added[key] = (record, added[key][1])
+                elif key in renamed:
+                    renamed[key] = (record, renamed[key][1])
+                else:
+                    if kind == "renamed":
+                        updated.pop(key, None)
+                    changed[key] = (record, at)
+
+    merged = dict(entries[-1])
+
+    def _timed(records):
+        return _sorted_records(
+            record if at == merged["timestamp"] else {**record, "at": at}
+            for record, at in records.values()
         )
 
+    merged["added"] = _timed(added)
+    merged["removed"] = _timed(removed)
+    for kind, changed in (("renamed", renamed), ("updated", updated)):
+        merged.pop(kind, None)
+        if changed:
+            merged[kind] = _timed(changed)
+    if churn:
+        merged["churn"] = churn
+    merged["folded"] = sum(entry.get("folded", 1) for entry in entries)
+    return merged
+
+
+def import_legacy_snapshots(account):
+    """Fold the timestamped followers_*.json snapshots of older versions into the delta log.
+
+    Each snapshot from before the log's first run becomes a log entry diffed
+    against the one before it (with a base every BASE_SNAPSHOT_INTERVAL
+    entries), the log's own first run gets the delta from the last of them,
+    and the files are deleted once the log is written. Returns the number of
+    snapshots imported.
+    """
+    if not os.path.isdir(account.history_dir):
+        return 0
+    entries = list(read_history_log(account.history_dir))
+    referenced = {entry["base"] for entry in entries if entry.get("base")}
+    first_run = entries[0]["timestamp"] if entries else None
+    legacy = []
+    for name in sorted(os.listdir(account.history_dir)):
+        match = LEGACY_SNAPSHOT_PATTERN.match(name)
+        if not match or name in referenced:
+            continue
+        run = datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").isoformat()
+        if first_run is not None and run >= first_run:
+            logger.warning(f"Leaving {name} alone: it is newer than the start of the history log")
+            continue
+        legacy.append((os.path.join(account.history_dir, name), run))
+    if not legacy:
+        return 0
+
+    imported, imported_paths, previous = [], [], None
+    for path, run in legacy:
+        try:
+            data = read_snapshot(path)
+        except (OSError, ValueError, SnapshotCorruptError) as e:
+            logger.warning(f"Skipping unreadable legacy snapshot {path}: {e}")
+            continue
+        data["followers"] = _sorted_records(data["followers"])
+        data["sorted_by"] = "username"
+        entry = {"timestamp": data.get("timestamp", run), "total": len(data["followers"])}
+        if previous:
+            entry.update(_history_delta(previous, data))
+        if len(imported) % BASE_SNAPSHOT_INTERVAL == 0:
+            entry["base"] = store_snapshot_object(account.history_dir, data)
+        imported.append(entry)
+        imported_paths.append(path)
+        previous = data
+    if not imported:
+        return 0
+
+    # The log's first run was a fresh start; give it the change since the last legacy run
+    if entries and "added" not in entries[0] and entries[0].get("base"):
+        base = read_snapshot(os.path.join(account.history_dir, entries[0]["base"]))
+        entries[0].update(_history_delta(previous, base))
+
+    tmp_path = account.deltas_file + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for entry in imported + entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    _fsync_path(tmp_path)
+    os.replace(tmp_path, account.deltas_file)
+    for path in imported_paths:
+        os.remove(path)
+    logger.info(f"Imported {len(imported)} legacy snapshots into {account.deltas_file}")
+    return len(imported)
+
+
+def compact_history(account, now=None):
+    """Thin an account's history to the retention policy; return the number of runs removed.
+
+    Keeps the last run of every hour for RETAIN_HOURLY_HOURS, of every day for
+    RETAIN_DAILY_DAYS and of every week after that. Removed runs are folded
+    into the next kept run's delta and bases no kept run points at are deleted;
+    the first kept run always keeps a base so the history stays rebuildable.
+    Snapshots left by versions without the log are imported into it first.
+    """
+    import_legacy_snapshots(account)
+    entries = list(read_history_log(account.history_dir))
+    if not entries:
+        return 0
+    now = now or datetime.now()
+
+    keep = [False] * len(entries)
+    last_in_bucket = {}
+    for i, entry in enumerate(entries):
+        bucket = retention_bucket(datetime.fromisoformat(entry["timestamp"]), now)
+        last_in_bucket[bucket] = i
+    for i in last_in_bucket.values():
+        keep[i] = True
+    keep[-1] = True
+    for i, entry in enumerate(entries):
+        if "added" not in entry:
+            # A fresh start with nothing to diff against; nothing can be folded into it
+            keep[i] = True
+            if i:
+                keep[i - 1] = True
+
+    compacted, pending, stale_bases = [], [], []
+    for entry, kept in zip(entries, keep):
+        pending.append(entry)
+        if kept:
+            compacted.append(_fold_deltas(pending) if len(pending) > 1 else entry)
+            pending = []
+        elif entry.get("base"):
+            stale_bases.append(entry["base"])
+    removed_runs = len(entries) - len(compacted)
+    if not removed_runs:
+        return 0
+
+    # Every rebuild starts from a base at or before its run, so the first kept
+    # run must have one; give it a fresh base if its own was folded away
+    first = compacted[0]
+    if not first.get("base"):
+        snapshot = rebuild_snapshot(account.history_dir, first["timestamp"])
+        if snapshot is None:
+            logger.warning("History has no base snapshot to start from. Skipping compaction")
+            return 0
+        first["base"] = store_snapshot_object(account.history_dir, snapshot)
+
+    tmp_path = account.deltas_file + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for entry in compacted:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    _fsync_path(tmp_path)
+    os.replace(tmp_path, account.deltas_file)
+    stale_bases = set(stale_bases) - {entry.get("base") for entry in compacted}
+    for base in stale_bases:
+        path = os.path.join(account.history_dir, base)
+        if os.path.exists(path):
+            os.remove(path)
+    logger.info(
+        f"Compacted history: {removed_runs} runs folded, {len(stale_bases)} base snapshots removed"
+    )
+    return removed_runs
+
+
+def history_events(history_dir, start=None):
+    """Return (timestamp, kind, record) follow/unfollow/rename events from the delta log, oldest first.
+
+    Only the small per-run deltas are read, never the snapshots. Runs that start
+    the history from scratch hold no events; followers who came and went
+    between compacted runs are replayed from their churn records.
+    """
+    events = []
+    for entry in read_history_log(history_dir):
+        if "added" in entry:
+            for kind, event in (("added", "follow"), ("removed", "unfollow"), ("renamed", "rename")):
+                events += [
+                    (f.get("at", entry["timestamp"]), event, _without_event_time(f))
+                    for f in entry.get(kind, [])
+                ]
+        for f in entry.get("churn", []):
+            record = {k: v for k, v in f.items() if k not in ("followed", "unfollowed")}
+            events.append((f["followed"], "follow", record))
+            events.append((f["unfollowed"], "unfollow", record))
+    events.sort(key=lambda event: event[0])
+    if start is not None:
+        events = [event for event in events if event[0] >= start]
+    return events
+
+
+def daily_net_change(events):
+    """Count follows and unfollows per day: {"YYYY-MM-DD": [follows, unfollows]}."""
+    days = {}
+    for timestamp, kind, _ in events:
+        counts = days.setdefault(timestamp[:10], [0, 0])
+        if kind == "follow":
+            counts[0] += 1
+        elif kind == "unfollow":
+            counts[1] += 1
+    return days
+
+
+def short_lived_follows(events, window_hours):
+    """Return (record, followed, unfollowed) for followers who unfollowed within window_hours."""
+    followed_at = {}
+    found = []
+    for timestamp, kind, record in events:
+        key = follower_key(record)
+        if kind == "follow":
+            followed_at[key] = timestamp
+        elif kind == "unfollow" and key in followed_at:
+            followed = followed_at.pop(key)
+            elapsed = datetime.fromisoformat(timestamp) - datetime.fromisoformat(followed)
+            if elapsed <= timedelta(hours=window_hours):
+                found.append((record, followed, timestamp))
+    return found
+
+
+def print_history_report(account, days, window_hours):
+    """Print the net change per day over the last days and the short-lived follows.
+
+    With the SQLite backend the indexed events table is queried; otherwise the
+    delta log is replayed.
+    """
+    start = (datetime.now() - timedelta(days=days)).isoformat()
+    use_database = STORAGE_BACKEND == "sqlite" and os.path.exists(account.database_file)
+    if use_database:
+        events = [
+            (timestamp, kind, {"username": uname, "name": name})
+            for timestamp, kind, uname, name in query_events(account, start=start)
+        ]
+    else:
+        events = history_events(account.history_dir, start)
+    print(f"=== @{account.username}: net change per day, last {days:g} days ===")
+    per_day = daily_net_change(events)
+    for day, (follows, unfollows) in sorted(per_day.items()):
+        print(f"{day}  +{follows:<5} -{unfollows:<5} net {follows - unfollows:+d}")
+    if not per_day:
+        print("No changes recorded")
+
+    print(f"=== @{account.username}: followed and unfollowed within {window_hours:g}h ===")
+    short_lived = short_lived_follows(events, window_hours)
+    for record, followed, unfollowed in short_lived:
+        line = f"{record['name']} (@{record['username']}): followed {followed}, unfollowed {unfollowed}"
+        first_followed = use_database and first_follow_time(account, record["username"])
+        if first_followed and first_followed < followed:
+            line += f" (first followed {first_followed})"
+        print(line)
+    if not short_lived:
+        print("None")
+
+
+def save_progress(account, followers, crawl_order=None, metadata=None):
+    """Save current follower records to the output and latest files and record it in the history.
+
+    Returns the snapshot that was written.
+
+    crawl_order (newest-first usernames) is stored truncated to RECENT_ORDER_SIZE
+    for incremental crawls; metadata is merged into the snapshot as-is.
+    """
+    os.makedirs(account.history_dir, exist_ok=True)
+    followers = _sorted_records(followers)
+    logger.info(f"Saving progress for {len(followers)} followers")
+
     data = {
-        "username": username,
+        "format_version": SNAPSHOT_VERSION,
+        "username": account.username,
         "timestamp": datetime.now().isoformat(),
-        "total_followers": len(follower_data),
-        "followers": followers_with_urls,
+        "total_followers": len(followers),
+        "sorted_by": "username",
+        "followers": followers,
     }
+    if crawl_order:
+        data["recent_order"] = crawl_order[:RECENT_ORDER_SIZE]
+    if metadata:
+        data.update(metadata)
+
+    if JSON_EXPORT:
+        base_file = append_history(account, data)
+
+        write_snapshot(account.output_file, data)
+        write_snapshot(account.latest_file, data, keep_previous=True)
+        for path in (account.output_file, account.latest_file):
+            remove_other_formats(path)
+
+        logger.info(
+            f"Data saved to {account.output_file} and {base_file or account.deltas_file}"
+        )
+
+    if STORAGE_BACKEND == "sqlite":
+        sqlite_save_snapshot(account, data)
+        logger.info(f"Data saved to {account.database_file}")
+    return data
 
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
 
-    with open(LATEST_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+# =====================
+# SQLite Storage
+# =====================
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS followers (
+    username TEXT PRIMARY KEY,
+    user_id TEXT,
+    name TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    timestamp TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    username TEXT NOT NULL,
+    name TEXT,
+    previous_username TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_followers_active ON followers(active);
+CREATE INDEX IF NOT EXISTS idx_snapshots_timestamp ON snapshots(timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_username ON events(username, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_kind ON events(kind, timestamp);
+"""
+
+# Snapshot keys stored in their own columns/tables rather than in snapshots.metadata
+SNAPSHOT_CORE_KEYS = ("username", "timestamp", "total_followers", "sorted_by", "followers")
+
+
+def open_database(account):
+    """Open (and create if needed) the account's SQLite follower store."""
+    os.makedirs(account.history_dir, exist_ok=True)
+    conn = sqlite3.connect(account.database_file)
+    conn.executescript(SQLITE_SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(followers)")}
+    if "user_id" not in columns:  # databases created before IDs were stored
+        conn.execute("ALTER TABLE followers ADD COLUMN user_id TEXT")
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    if "previous_username" not in columns:  # databases created before renames were tracked
+        conn.execute("ALTER TABLE events ADD COLUMN previous_username TEXT")
+    return conn
+
+
+def sqlite_save_snapshot(account, data):
+    """Record a snapshot and its follow/unfollow events in one transaction.
+
+    The first snapshot in an empty database only seeds the followers table;
+    after that every addition is a 'follow' event and every removal an
+    'unfollow' event, except that a removal and an addition with the same
+    user ID are one 'rename' event.
+    """
+    timestamp = data["timestamp"]
+    current = {f["username"]: f["name"] for f in data["followers"]}
+    user_ids = {f["username"]: f.get("id") for f in data["followers"]}
+    metadata = {k: v for k, v in data.items() if k not in SNAPSHOT_CORE_KEYS}
+
+    with closing(open_database(account)) as conn, conn:
+        has_history = conn.execute("SELECT 1 FROM snapshots LIMIT 1").fetchone() is not None
+        active, active_ids = {}, {}
+        for uname, name, user_id in conn.execute(
+            "SELECT username, name, user_id FROM followers WHERE active = 1"
+        ):
+            active[uname] = name
+            if user_id:
+                active_ids[user_id] = uname
+        snapshot_id = conn.execute(
+            "INSERT INTO snapshots (timestamp, total, metadata) VALUES (?, ?, ?)",
+            (timestamp, len(current), json.dumps(metadata, ensure_ascii=False)),
+        ).lastrowid
+
+        if has_history:
+            removed = active.keys() - current.keys()
+            events = []
+            for u in current.keys() - active.keys():
+                previous = active_ids.get(user_ids[u])
+                if previous in removed:
+                    removed.discard(previous)
+                    events.append((snapshot_id, timestamp, "rename", u, current[u], previous))
+                else:
+                    events.append((snapshot_id, timestamp, "follow", u, current[u], None))
+            events += [(snapshot_id, timestamp, "unfollow", u, active[u], None) for u in removed]
+            conn.executemany(
+                """INSERT INTO events (snapshot_id, timestamp, kind, username, name, previous_username)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                events,
+            )
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_file = os.path.join(HISTORY_DIR, f"followers_{timestamp}.json")
-    with open(backup_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        conn.executemany(
+            """INSERT INTO followers (username, user_id, name, first_seen, last_seen, active)
+               VALUES (?, ?, ?, ?, ?, 1)
+               ON CONFLICT(username) DO UPDATE SET
+                   user_id = COALESCE(excluded.user_id, user_id),
+                   name = excluded.name, last_seen = excluded.last_seen, active = 1""",
+            [(u, user_ids[u], name, timestamp, timestamp) for u, name in current.items()],
+        )
+        conn.executemany(
+            "UPDATE followers SET active = 0 WHERE username = ?",
+            [(u,) for u in active.keys() - current.keys()],
+        )
 
-    logger.info(f"Data saved to {OUTPUT_FILE} and {backup_file}")
 
+def sqlite_load_latest(account):
+    """Return the latest snapshot from the SQLite store in the JSON snapshot shape."""
+    if not os.path.exists(account.database_file):
+        return None
+    with closing(open_database(account)) as conn:
+        row = conn.execute(
+            "SELECT timestamp, metadata FROM snapshots ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        followers = conn.execute(
+            "SELECT name, username, user_id FROM followers WHERE active = 1 ORDER BY username, name"
+        ).fetchall()
 
-def smart_scroll(page):
-    """Scroll the followers timeline to load more followers."""
+    data = {
+        "username": account.username,
+        "timestamp": row[0],
+        "total_followers": len(followers),
+        "followers": [
+            follower_record(name, uname, user_id) for name, uname, user_id in followers
+        ],
+    }
+    data.update(json.loads(row[1] or "{}"))
+    data["format_version"] = SNAPSHOT_VERSION
+    data["sorted_by"] = "username"
+    return data
+
+
+def first_follow_time(account, username):
+    """Return when @username first followed the account (ISO timestamp), or None."""
+    with closing(open_database(account)) as conn:
+        row = conn.execute(
+            "SELECT MIN(timestamp) FROM events WHERE username = ? AND kind = 'follow'",
+            (username,),
+        ).fetchone()
+        if row[0]:
+            return row[0]
+        row = conn.execute(
+            "SELECT first_seen FROM followers WHERE username = ?", (username,)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def query_events(account, kind=None, start=None, end=None):
+    """Return (timestamp, kind, username, name) events, optionally filtered by kind and time range.
+
+    start is inclusive and end exclusive; both are ISO timestamps or dates.
+    """
+    clauses, params = [], []
+    if kind:
+        clauses.append("kind = ?")
+        params.append(kind)
+    if start:
+        clauses.append("timestamp >= ?")
+        params.append(start)
+    if end:
+        clauses.append("timestamp < ?")
+        params.append(end)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with closing(open_database(account)) as conn:
+        return conn.execute(
+            f"SELECT timestamp, kind, username, name FROM events {where} ORDER BY timestamp",
+            params,
+        ).fetchall()
+
+
+async def smart_scroll(page, step=SCROLL_STEP_DEFAULT):
+    """Scroll the followers timeline by the given fraction of the viewport."""
+    timeline_px = int(TIMELINE_SCROLL_PX * step / SCROLL_STEP_DEFAULT)
     try:
-        page.evaluate(
+        await page.evaluate(
             f"""() => {{
             const currentScroll = window.pageYOffset;
             const viewportHeight = window.innerHeight;
-            window.scrollTo(0, currentScroll + viewportHeight * 0.7);
+            window.scrollTo(0, currentScroll + viewportHeight * {step});
             const timeline = document.querySelector('{TIMELINE_SELECTOR}');
             if (timeline) {{
-                timeline.scrollBy(0, 400);
+                timeline.scrollBy(0, {timeline_px});
             }}
         }}"""
         )
     except Exception as e:
         logger.warning(f"Scroll JS error: {e}")
-    time.sleep(SCROLL_SLEEP_SEC)
 
 
-def wait_for_new_content(page, old_count, timeout=WAIT_NEW_CONTENT_TIMEOUT):
-    """Wait for new follower cells to appear after scrolling, up to a timeout."""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            if len(page.query_selector_all(CELL_SELECTOR)) > old_count:
-                return True
-        except Exception as e:
-            logger.debug(f"wait_for_new_content: {e}")
-        time.sleep(WAIT_NEW_CONTENT_INTERVAL)
-    return False
+class ScrollPacer:
+    """Adaptive scroll pacing: speeds up while pages load quickly, backs off on throttling.
 
+    Throttling is detected from HTTP 429 responses on GraphQL requests and from
+    X's "Something went wrong" error cell in the timeline.
+    """
 
-def scroll_followers_list(page, username):
-    """Scroll and collect all followers for the given username."""
-    logger.info("Starting follower collection process...")
+    def __init__(self):
+        self.step = SCROLL_STEP_DEFAULT
+        self.delay = 0.0
+        self.avg_load_time = None
+        self.throttle_streak = 0
+        self._rate_limited = 0
+
+    def attach(self, page):
+        """Count rate-limited GraphQL responses on the page."""
+
+        def on_response(response):
+            if response.status == 429 and "/graphql/" in response.url:
+                self._rate_limited += 1
+
+        page.on("response", on_response)
+
+    async def check_throttled(self, page):
+        """Return True if a 429 or an error cell appeared since the last check."""
+        throttled = self._rate_limited > 0
+        self._rate_limited = 0
+        return await recover_from_error_cell(page) or throttled
+
+    def record(self, load_time, throttled):
+        """Update step and delay from the last page load (load_time None if nothing loaded)."""
+        if throttled:
+            self.throttle_streak += 1
+            self.delay = min(
+                max(self.delay * 2, THROTTLE_BACKOFF_BASE_SEC), SCROLL_DELAY_MAX_SEC
+            )
+            self.step = max(self.step * 0.5, SCROLL_STEP_MIN)
+            logger.info(
+                f"Throttled ({self.throttle_streak}x), backing off to {self.delay:.1f}s between scrolls"
+            )
+            return
+
+        self.throttle_streak = 0
+        if load_time is None:
+            return
+        if self.avg_load_time is None:
+            self.avg_load_time = load_time
+        else:
+            self.avg_load_time = 0.8 * self.avg_load_time + 0.2 * load_time
+        if self.avg_load_time < FAST_LOAD_SEC:
+            self.step = min(self.step * 1.2, SCROLL_STEP_MAX)
+            self.delay = self.delay * 0.5 if self.delay > 0.1 else 0.0
+        logger.debug(
+            f"Pacing: step={self.step:.2f} delay={self.delay:.2f}s avg_load={self.avg_load_time:.2f}s"
+        )
+
+    async def pause(self):
+        """Sleep for the current delay between scrolls."""
+        if self.delay > 0:
+            await asyncio.sleep(self.delay)
+
+
+async def recover_from_error_cell(page):
+    """Detect X's "Something went wrong" timeline error and click Retry if present.
+
+    The error is matched structurally, as a cell with a Retry button and no
+    profile link, so follower bios quoting the error text don't count.
+    """
     try:
-        page.wait_for_selector(CELL_SELECTOR, timeout=INITIAL_SELECTOR_TIMEOUT)
-        logger.info("Initial followers loaded")
+        return await page.evaluate(
+            f"""() => {{
+            const timeline = document.querySelector('{TIMELINE_SELECTOR}') || document.body;
+            const cells = Array.from(timeline.querySelectorAll('{CELL_SELECTOR}'));
+            for (const cell of cells.length ? cells : [timeline]) {{
+                if (cell.querySelector('a[role="link"][href^="/"]')) {{
+                    continue;
+                }}
+                const retry = Array.from(cell.querySelectorAll('button, [role="button"]'))
+                    .find(b => b.innerText.trim() === 'Retry');
+                if (retry) {{
+                    retry.click();
+                    return true;
+                }}
+            }}
+            return false;
+        }}"""
+        )
     except Exception as e:
-        logger.warning(f"Could not find follower cells: {e}. Trying alternative approach...")
+        logger.debug(f"Error-cell check failed: {e}")
+        return False
 
-    follower_data = set()
-    no_new_content_count = 0
-    scroll_count = 0
 
-    initial_follower_data = get_follower_data(page)
-    for item in initial_follower_data:
-        follower_data.add((item["name"], item["username"]))
+# Page-side progress marker: cells seen by the observer, or the current cell count
+CONTENT_MARKER_JS = (
+    f"window.__xfm ? window.__xfm.added : document.querySelectorAll('{CELL_SELECTOR}').length"
+)
+
 
-    logger.info(f"Initial collection: {len(follower_data)} unique followers")
+async def get_content_marker(page):
+    """Return a counter that increases whenever new follower cells are rendered."""
+    try:
+        return await page.evaluate(f"() => {CONTENT_MARKER_JS}")
+    except Exception as e:
+        logger.warning(f"Error reading content marker: {e}")
+        return 0
 
-    while no_new_content_count < NO_NEW_CONTENT_LIMIT and scroll_count < SCROLL_LIMIT:
-        scroll_count += 1
-        logger.debug(f"Scroll #{scroll_count}")
 
-        try:
-            current_cells = len(page.query_selector_all(CELL_SELECTOR))
-        except Exception as e:
-            logger.warning(f"Error counting cells: {e}")
-            current_cells = 0
-        smart_scroll(page)
-        wait_for_new_content(page, current_cells, timeout=WAIT_NEW_CONTENT_TIMEOUT)
+async def wait_for_new_content(page, old_marker, timeout=WAIT_NEW_CONTENT_TIMEOUT):
+    """Wait until new follower cells render after scrolling, up to a timeout.
+
+    Resolves on the first animation frame where the content marker has moved
+    past old_marker, so fast responses are not padded with fixed sleeps.
+    """
+    try:
+        await page.wait_for_function(
+            f"(old) => ({CONTENT_MARKER_JS}) > old",
+            arg=old_marker,
+            timeout=timeout * 1000,
+        )
+        return True
+    except Exception as e:
+        logger.debug(f"wait_for_new_content: {e}")
+        return False
+
 
-        previous_count = len(follower_data)
-        for item in get_follower_data(page):
-            follower_data.add((item["name"], item["username"]))
+async def scroll_followers_list(page, account, collector=None, incremental_base=None, resume=None):
+    """Scroll and collect all followers for the given account.
 
-        followers_added = len(follower_data) - previous_count
+    When a GraphQL collector is given, followers are read from intercepted API
+    responses instead of re-scanning the DOM after every scroll. With an
+    incremental_base snapshot the crawl stops once it overlaps that snapshot.
+    A resume checkpoint seeds the follower set and fast-scrolls past the
+    followers it already holds. Returns the CrawlState.
+    """
+    logger.info("Starting follower collection process...")
+    try:
+        await page.wait_for_selector(CELL_SELECTOR, timeout=INITIAL_SELECTOR_TIMEOUT)
+        logger.info("Initial followers loaded")
+    except Exception as e:
+        logger.warning(f"Could not find follower cells: {e}. Trying alternative approach...")
+
+    state = CrawlState(incremental_base)
+    if resume:
+        state.restore(resume)
+    no_new_content_count = 0
+    scroll_count = 0  # per run, so SCROLL_LIMIT bounds each resumed run too
+    forward_count = 0  # fast-forward scrolls after a resume, not counted against SCROLL_LIMIT
+
+    if collector is not None and collector["responses"] == 0:
+        logger.warning("No Followers GraphQL responses captured yet. Falling back to DOM scraping")
+
+    pacer = ScrollPacer()
+    pacer.attach(page)
+    observer = await install_follower_observer(page)
+    # Followers who arrived since the interrupted run sit above the restored ones,
+    # so keep fast-forwarding until the checkpoint's last follower shows up
+    restored = set(state.order)
+    reached_restored = False
+    fast_forward = state.forwarding = state.last_seen is not None
+    if fast_forward:
+        logger.info(f"Fast-forwarding to @{state.last_seen}...")
+    items = await collect_visible_followers(page, collector, observer)
+    followers_added = state.add(items)
+
+    logger.info(f"Initial collection: {len(state.followers)} unique followers")
+
+    while (
+        no_new_content_count < NO_NEW_CONTENT_LIMIT
+        and scroll_count < SCROLL_LIMIT
+        and not state.overlap_found
+    ):
+        if fast_forward:
+            known = [item["username"] in restored for item in items]
+            # past the restored block without seeing last_seen: they unfollowed meanwhile
+            passed = reached_restored and items and not any(known)
+            reached_restored = reached_restored or any(known)
+            if passed or any(item["username"] == state.last_seen for item in items):
+                fast_forward = state.forwarding = False
+                logger.info(f"Caught up with the checkpoint after {forward_count} scrolls")
+
+        if fast_forward:
+            forward_count += 1
+            logger.debug(f"Fast-forward scroll #{forward_count}")
+        else:
+            scroll_count += 1
+            state.scrolls += 1
+            logger.debug(f"Scroll #{scroll_count}")
+
+        marker = await get_content_marker(page)
+        await smart_scroll(page, SCROLL_STEP_MAX if fast_forward else pacer.step)
+        started = time.monotonic()
+        loaded = await wait_for_new_content(page, marker, timeout=WAIT_NEW_CONTENT_TIMEOUT)
+        throttled = await pacer.check_throttled(page)
+        pacer.record(time.monotonic() - started if loaded else None, throttled)
+
+        items = await collect_visible_followers(page, collector, observer)
+        followers_added = state.add(items)
         logger.debug(f"New followers found: {followers_added}")
 
-        if followers_added == 0:
+        if followers_added > 0:
+            no_new_content_count = 0
+        elif not throttled and not (fast_forward and loaded):
+            # neither rate limiting nor followers known from the resumed run end the crawl
             no_new_content_count += 1
             logger.debug(f"No new followers ({no_new_content_count}/{NO_NEW_CONTENT_LIMIT})")
-        else:
-            no_new_content_count = 0
 
+        if fast_forward:
+            if throttled:
+                scroll_count += 1  # backoffs still count, so throttling can't stall the resume
+                await pacer.pause()
+            continue
         if scroll_count % CHECKPOINT_INTERVAL == 0:
-            save_progress(follower_data, username)
-            logger.info(
-                f"Progress checkpoint: {len(follower_data)} followers collected"
-            )
+            write_checkpoint(account, state)
+        await pacer.pause()
 
-    logger.info(f"Scrolling completed! Total followers collected: {len(follower_data)}")
-    save_progress(follower_data, username)
-    return follower_data
+    if scroll_count >= SCROLL_LIMIT and no_new_content_count < NO_NEW_CONTENT_LIMIT:
+        state.interrupted = not state.overlap_found
+
+    logger.info(f"Scrolling completed! Total followers collected: {len(state.followers)}")
+    return finish_crawl(state, account)
 
 
 def extract_username_from_url(url):
@@ -374,122 +2410,283 @@ def extract_username_from_url(url):
     return "unknown"
 
 
-def main():
-    """Main entry point: launches browser, collects followers, compares with previous data, and logs changes."""
-    logger.info("Starting X followers monitor")
-    logger.info(f"Monitoring followers for username: {USERNAME}")
+def log_changes(changes):
+    """Log a summary of follower changes since the previous run."""
+    logger.info("=== CHANGES SINCE LAST RUN ===")
+    if changes["unfollowed_count"] > 0:
+        logger.info(
+            f"❌ {changes['unfollowed_count']} people unfollowed"
+        )
+        for user in changes["unfollowed"]:
+            logger.info(f"  - {user['name']} (@{user['username']})")
+    else:
+        logger.info("✅ No one unfollowed")
 
-    # Ensure necessary directories exist
-    os.makedirs(HISTORY_DIR, exist_ok=True)
-    logger.info(f"Ensured {HISTORY_DIR} directory exists")
+    if changes["new_followers_count"] > 0:
+        logger.info(
+            f"🎉 {changes['new_followers_count']} new followers:"
+        )
+        for user in changes["new_followers"]:
+            logger.info(f"  - {user['name']} (@{user['username']})")
+    else:
+        logger.info("📊 No new followers")
 
-    try:
-        cookies = load_cookies()
-        cookies = [normalize_same_site(cookie) for cookie in cookies]
-    except ValueError as e:
-        logger.error(f"Error loading cookies: {e}")
-        return
-    except Exception as e:
-        logger.error(f"Unexpected error loading cookies: {e}", exc_info=True)
-        return
+    if changes.get("renamed_count", 0) > 0:
+        logger.info(f"✏️ {changes['renamed_count']} followers renamed:")
+        for rename in changes["renamed"]:
+            name, handle = rename_labels(rename)
+            logger.info(f"  - {name} ({handle})")
+
+    net_change = (
+        changes["new_followers_count"] - changes["unfollowed_count"]
+    )
+    if net_change > 0:
+        logger.info(f"📈 Net gain: +{net_change} followers")
+    elif net_change < 0:
+        logger.info(f"📉 Net loss: {net_change} followers")
+    else:
+        logger.info("➖ No net change in followers")
+
+
+async def open_account_context(playwright, browser, account):
+    """Open the account's browser context, warm-started from its profile or saved state."""
+    if account.profile_dir:
+        logger.info(f"Using persistent browser profile {account.profile_dir}")
+        return await playwright.chromium.launch_persistent_context(
+            account.profile_dir,
+            headless=True,
+            args=BROWSER_ARGS,
+            viewport=VIEWPORT,
+            user_agent=USER_AGENT,
+        )
+
+    storage_state = None
+    if account.storage_state_file and os.path.exists(account.storage_state_file):
+        logger.info(f"Restoring session state from {account.storage_state_file}")
+        storage_state = account.storage_state_file
+    return await browser.new_context(
+        viewport=VIEWPORT, user_agent=USER_AGENT, storage_state=storage_state
+    )
 
-    try:
-        with sync_playwright() as p:
-            logger.info("Launching browser in headless mode")
-            browser = p.chromium.launch(
-                headless=True,
-                args=[
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-gpu",
-                    "--disable-web-security",
-                    "--disable-background-timer-throttling",
-                    "--disable-backgrounding-occluded-windows",
-                    "--disable-renderer-backgrounding",
-                ],
-            )
-            context = browser.new_context(
-                viewport={"width": 1920, "height": 4200},
-                user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            )
-            context.add_cookies(cookies)
-            page = context.new_page()
 
-            url = f"https://x.com/{USERNAME}/followers"
+async def close_account_context(context, account):
+    """Save the account's storage state (if enabled) and close its context."""
+    if account.storage_state_file:
+        try:
+            os.makedirs(os.path.dirname(account.storage_state_file) or ".", exist_ok=True)
+            await context.storage_state(path=account.storage_state_file)
+        except Exception as e:
+            logger.warning(f"Could not save session state: {e}")
+    await context.close()
+
+
+async def monitor_account(playwright, browser, account, semaphore):
+    """Collect one account's followers in its own browser context and report changes."""
+    current_account.set(account.username)
+    async with semaphore:
+        logger.info(f"Monitoring followers for username: {account.username}")
+        os.makedirs(account.history_dir, exist_ok=True)
+
+        context = await open_account_context(playwright, browser, account)
+        try:
+            await context.add_cookies(account.cookies)
+            page = context.pages[0] if context.pages else await context.new_page()
+            if BLOCK_RESOURCES:
+                await install_resource_blocking(context, page)
+
+            attach_profile_collector(page, account)
+            collector = None
+            if COLLECTION_MODE in ("graphql", "cursor"):
+                logger.info("Collecting followers from intercepted GraphQL responses")
+                collector = attach_graphql_collector(page)
+
+            url = f"https://x.com/{account.username}/followers"
             username = extract_username_from_url(url)
             logger.info(f"Navigating to {username}'s followers page")
 
-            page.goto(url)
-            page.wait_for_load_state("domcontentloaded")
-            time.sleep(3)
+            await page.goto(url, wait_until="domcontentloaded")
+            try:
+                await page.wait_for_selector(
+                    f"{CELL_SELECTOR}, {LOGIN_SELECTOR}", timeout=INITIAL_SELECTOR_TIMEOUT
+                )
+            except Exception as e:
+                logger.warning(f"Followers timeline did not render: {e}")
 
-            if "log in" in page.content().lower():
+            if "log in" in (await page.content()).lower():
                 logger.error("Not logged in properly. Check your cookies.")
-                browser.close()
                 return
 
             logger.info("Page loaded successfully")
-            previous_data = load_previous_data()
+            previous_data = account.previous_data
+            if previous_data is None:
+                previous_data = load_previous_data(account)
+                if previous_data:
+                    account.remember_snapshot(previous_data)
+
+            incremental_base = None
+            if CRAWL_MODE == "incremental":
+                if full_sweep_due(previous_data):
+                    logger.info("Full sweep due - crawling the complete follower list")
+                else:
+                    logger.info("Incremental crawl - stopping at the previous snapshot")
+                    incremental_base = previous_data
+
+            resume = None
+            if RESUME_MODE:
+                resume = load_checkpoint(account)
+                if resume is None:
+                    logger.info("No checkpoint to resume - starting a new crawl")
 
             try:
-                follower_data = scroll_followers_list(page, username)
-                current_data = {
-                    "username": username,
-                    "timestamp": datetime.now().isoformat(),
-                    "total_followers": len(follower_data),
-                    "followers": [
-                        {
-                            "name": name,
-                            "username": uname,
-                            "profile_url": f"https://x.com/{uname}",
-                        }
-                        for name, uname in sorted(follower_data)
-                    ],
-                }
+                state = None
+                if COLLECTION_MODE == "cursor":
+                    state = await walk_followers_cursor(
+                        page, account, collector, incremental_base, resume
+                    )
+                if state is None:
+                    state = await scroll_followers_list(
+                        page, account, collector, incremental_base, resume
+                    )
+                current_data = state.snapshot
+                if current_data is None:
+                    return
 
                 if previous_data:
                     logger.info(f"Comparing with data from {previous_data['timestamp']}")
                     changes = compare_followers(previous_data, current_data)
                     if changes:
-                        logger.info("=== CHANGES SINCE LAST RUN ===")
-                        if changes["unfollowed_count"] > 0:
-                            logger.info(
-                                f"❌ {changes['unfollowed_count']} people unfollowed"
-                            )
-                            for user in changes["unfollowed"]:
-                                logger.info(f"  - {user['name']} (@{user['username']})")
-                        else:
-                            logger.info("✅ No one unfollowed")
-
-                        if changes["new_followers_count"] > 0:
-                            logger.info(
-                                f"🎉 {changes['new_followers_count']} new followers:"
-                            )
-                            for user in changes["new_followers"]:
-                                logger.info(f"  - {user['name']} (@{user['username']})")
-                        else:
-                            logger.info("📊 No new followers")
-
-                        net_change = (
-                            changes["new_followers_count"] - changes["unfollowed_count"]
+                        log_changes(changes)
+                        await asyncio.get_running_loop().run_in_executor(
+                            None, contextvars.copy_context().run, send_to_discord, changes, username
                         )
-                        if net_change > 0:
-                            logger.info(f"📈 Net gain: +{net_change} followers")
-                        elif net_change < 0:
-                            logger.info(f"📉 Net loss: {net_change} followers")
-                        else:
-                            logger.info("➖ No net change in followers")
-                        
-                        send_to_discord(changes, username)
 
                 else:
                     logger.info("First run - no previous data to compare")
 
+                account.remember_snapshot(current_data)
+
             except Exception as e:
                 logger.error(f"Error during follower collection: {e}", exc_info=True)
+        finally:
+            await close_account_context(context, account)
+
+
+async def run_monitor(accounts):
+    """Launch one browser and monitor all accounts with bounded concurrency."""
+    async with async_playwright() as p:
+        browser = None
+        if not PROFILE_DIR:
+            logger.info("Launching browser in headless mode")
+            browser = await p.chromium.launch(headless=True, args=BROWSER_ARGS)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        try:
+            results = await asyncio.gather(
+                *(monitor_account(p, browser, account, semaphore) for account in accounts),
+                return_exceptions=True,
+            )
+            for account, result in zip(accounts, results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        f"Monitoring @{account.username} failed: {result}", exc_info=result
+                    )
+        finally:
+            if browser is not None:
+                logger.info("Closing browser")
+                await browser.close()
+
+
+async def run_account_schedule(playwright, get_browser, account, semaphore):
+    """Crawl one account forever at its interval, with random jitter between runs."""
+    current_account.set(account.username)
+    jitter = DAEMON_JITTER_MINUTES * 60
+    # Stagger the first runs so accounts don't all start at once
+    await asyncio.sleep(random.uniform(0, jitter))
+    while True:
+        try:
+            await monitor_account(playwright, await get_browser(), account, semaphore)
+        except Exception as e:
+            logger.error(f"Scheduled run failed: {e}", exc_info=True)
+        delay = max(60, account.interval_minutes * 60 + random.uniform(-jitter, jitter))
+        logger.info(f"Next crawl in {delay / 60:.1f} minutes")
+        await asyncio.sleep(delay)
+
+
+async def run_daemon(accounts):
+    """Keep one browser alive and crawl each account on its own schedule."""
+    async with async_playwright() as p:
+        browser = None
+        browser_lock = asyncio.Lock()
+
+        async def get_browser():
+            nonlocal browser
+            if PROFILE_DIR:
+                return None
+            async with browser_lock:
+                if browser is None or not browser.is_connected():
+                    logger.info("Launching browser in headless mode")
+                    browser = await p.chromium.launch(headless=True, args=BROWSER_ARGS)
+                return browser
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        try:
+            await asyncio.gather(
+                *(run_account_schedule(p, get_browser, account, semaphore) for account in accounts)
+            )
+        finally:
+            if browser is not None:
+                logger.info("Closing browser")
+                await browser.close()
+
+
+def main():
+    """Main entry point: launches browser, collects followers, compares with previous data, and logs changes."""
+    logger.info("Starting X followers monitor")
+
+    if SNAPSHOT_FORMAT not in SNAPSHOT_EXTENSIONS:
+        logger.error(f"Unknown X_SNAPSHOT_FORMAT {SNAPSHOT_FORMAT!r}. Exiting.")
+        sys.exit(1)
+    if SNAPSHOT_FORMAT == "jsonl.zst" and zstandard is None:
+        logger.error("X_SNAPSHOT_FORMAT=jsonl.zst requires the zstandard package. Exiting.")
+        sys.exit(1)
+
+    if COMMAND not in ("monitor", "compact", "history"):
+        logger.error(f"Unknown command {COMMAND!r}. Exiting.")
+        sys.exit(1)
+
+    try:
+        accounts = load_accounts(with_cookies=COMMAND == "monitor")
+    except ValueError as e:
+        logger.error(f"Error loading accounts: {e}. Exiting.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Unexpected error loading accounts: {e}", exc_info=True)
+        sys.exit(1)
+
+    if COMMAND == "compact":
+        for account in accounts:
+            current_account.set(account.username)
+            compact_history(account)
+        return
+    if COMMAND == "history":
+        try:
+            days, window = cli_number("days", 90), cli_number("window", 24)
+        except ValueError as e:
+            logger.error(f"Invalid history option: {e}. Exiting.")
+            sys.exit(1)
+        for account in accounts:
+            print_history_report(account, days, window)
+        return
+
+    logger.info(f"Monitoring {len(accounts)} account(s), up to {MAX_CONCURRENCY} at a time")
 
-            logger.info("Closing browser")
-            browser.close()
+    try:
+        if DAEMON_MODE:
+            logger.info("Running as a daemon (Ctrl+C to stop)")
+            asyncio.run(run_daemon(accounts))
+        else:
+            asyncio.run(run_monitor(accounts))
+    except KeyboardInterrupt:
+        logger.info("Stopped")
     except Exception as e:
         logger.error(f"Fatal error in Playwright session: {e}", exc_info=True)
 